@@ -0,0 +1 @@
+"""core/jobs - central background job scheduler (st.jobs)"""
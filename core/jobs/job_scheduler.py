@@ -0,0 +1,226 @@
+"""
+core/jobs/job_scheduler.py
+One scheduler for all periodic background work (st.jobs) instead of a
+timer thread per subsystem.
+  - heap-ordered timer on a single thread + bounded worker pool
+  - per-job jitter, concurrency limit and exponential back-off on failure
+  - missed runs are coalesced (one catch-up run, not a burst)
+  - heavy jobs wait while the UI reports itself busy
+  - stats() shows what is registered / running / failing
+
+    jobs = JobScheduler(max_workers=3)
+    jobs.add("backup", recovery.run_backup, interval_s=24 * 3600, heavy=True)
+    jobs.start()
+"""
+import heapq, logging, random, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("AGMS.Jobs")
+
+BUSY_RETRY_S = 5.0          # heavy job re-check delay while the UI is busy
+
+
+class Job:
+    __slots__ = ("name", "fn", "interval_s", "jitter", "heavy", "max_concurrency",
+                 "coalesce", "max_backoff_s", "one_shot", "paused",
+                 "due", "gen", "running", "runs", "failures", "missed",
+                 "last_ms", "total_ms", "last_error", "last_run")
+
+    def __init__(self, name, fn, interval_s, jitter, heavy, max_concurrency,
+                 coalesce, max_backoff_s, one_shot):
+        self.name, self.fn, self.interval_s = name, fn, interval_s
+        self.jitter, self.heavy, self.max_concurrency = jitter, heavy, max_concurrency
+        self.coalesce, self.max_backoff_s, self.one_shot = coalesce, max_backoff_s, one_shot
+        self.paused = False
+        self.due = 0.0
+        self.gen = 0
+        self.running = self.runs = self.failures = self.missed = 0
+        self.last_ms = self.total_ms = 0.0
+        self.last_error = None
+        self.last_run = None
+
+
+class JobScheduler:
+    def __init__(self, max_workers: int = 3, busy_probe=None):
+        self.busy_probe = busy_probe       # fn() -> bool, True while the UI is busy
+        self.on_job_done = None            # fn(job, elapsed_ms, error) - worker thread
+        self._jobs  = {}
+        self._heap  = []                   # (due, seq, name, gen)
+        self._seq   = 0
+        self._cond  = threading.Condition()
+        self._pool  = ThreadPoolExecutor(max_workers=max_workers,
+                                         thread_name_prefix="agms-job")
+        self._thread  = None
+        self._stopped = False
+        self._ui_busy = False
+
+    # ── Registration ─────────────────────────────────────────────────────────
+    def add(self, name: str, fn, interval_s: float, first_delay_s: float = None,
+            jitter: float = 0.1, heavy: bool = False, max_concurrency: int = 1,
+            coalesce: bool = True, max_backoff_s: float = 3600.0) -> Job:
+        """Run fn() every interval_s seconds. jitter is a fraction of the
+        interval (0.1 = +/-10%) so jobs registered together don't fire together."""
+        job = Job(name, fn, float(interval_s), jitter, heavy, max_concurrency,
+                  coalesce, max_backoff_s, one_shot=False)
+        delay = interval_s if first_delay_s is None else first_delay_s
+        return self._register(job, delay)
+
+    def run_once(self, name: str, fn, delay_s: float = 0.0, heavy: bool = False) -> Job:
+        job = Job(name, fn, 0.0, 0.0, heavy, 1, True, 0.0, one_shot=True)
+        return self._register(job, delay_s)
+
+    def _register(self, job: Job, delay: float) -> Job:
+        with self._cond:
+            old = self._jobs.get(job.name)
+            if old is not None:
+                job.gen = old.gen + 1
+            self._jobs[job.name] = job
+            self._push(job, time.monotonic() + max(0.0, delay))
+        return job
+
+    def remove(self, name: str):
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job:
+                job.gen += 1
+
+    def pause(self, name: str):
+        with self._cond:
+            if name in self._jobs:
+                self._jobs[name].paused = True
+
+    def resume(self, name: str):
+        with self._cond:
+            job = self._jobs.get(name)
+            if job and job.paused:
+                job.paused = False
+                self._push(job, max(job.due, time.monotonic()))
+
+    def trigger(self, name: str):
+        """Run a job now (its regular schedule continues afterwards)."""
+        with self._cond:
+            job = self._jobs.get(name)
+            if job:
+                self._push(job, time.monotonic())
+
+    def set_ui_busy(self, busy: bool):
+        with self._cond:
+            self._ui_busy = bool(busy)
+            self._cond.notify()
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="agms-jobs", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = False):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> list:
+        now = time.monotonic()
+        with self._cond:
+            return [{
+                "job":        j.name,
+                "interval_s": j.interval_s,
+                "heavy":      j.heavy,
+                "paused":     j.paused,
+                "running":    j.running,
+                "runs":       j.runs,
+                "failures":   j.failures,
+                "missed":     j.missed,
+                "next_in_s":  round(max(0.0, j.due - now), 1),
+                "last_ms":    round(j.last_ms, 1),
+                "avg_ms":     round(j.total_ms / j.runs, 1) if j.runs else 0.0,
+                "last_error": str(j.last_error) if j.last_error else None,
+            } for j in self._jobs.values()]
+
+    # ── Internals (call with self._cond held) ───────────────────────────────
+    def _push(self, job: Job, due: float):
+        job.gen += 1
+        job.due = due
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, job.name, job.gen))
+        self._cond.notify()
+
+    def _jittered(self, seconds: float, frac: float) -> float:
+        return seconds * (1 + random.uniform(-frac, frac)) if frac else seconds
+
+    def _ui_is_busy(self) -> bool:
+        if self._ui_busy:
+            return True
+        if self.busy_probe:
+            try:
+                return bool(self.busy_probe())
+            except Exception:
+                return False
+        return False
+
+    def _loop(self):
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _, name, gen = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                job = self._jobs.get(name)
+                if job is None or job.gen != gen or job.paused:
+                    continue                                  # stale / removed
+                self._fire(job, now)
+
+    def _fire(self, job: Job, now: float):
+        if job.heavy and self._ui_is_busy():
+            self._push(job, now + BUSY_RETRY_S)
+            return
+        if job.running >= job.max_concurrency:
+            job.missed += 1                                   # still running: coalesce
+            if not job.one_shot:
+                self._push(job, now + self._jittered(job.interval_s, job.jitter))
+            return
+        if not job.one_shot:
+            nxt = job.due + job.interval_s
+            if job.coalesce and nxt <= now:                   # fell behind: one catch-up only
+                job.missed += int((now - job.due) // job.interval_s)
+                nxt = now + job.interval_s
+            self._push(job, self._jittered(nxt - now, job.jitter) + now)
+        job.running += 1
+        self._pool.submit(self._execute, job)
+
+    def _execute(self, job: Job):
+        t, err = time.perf_counter(), None
+        try:
+            job.fn()
+        except Exception as e:
+            err = e
+            logger.warning(f"Job {job.name}: {e}")
+        ms = (time.perf_counter() - t) * 1000
+        with self._cond:
+            job.running -= 1
+            job.runs += 1
+            job.last_ms = ms
+            job.total_ms += ms
+            job.last_run = time.time()
+            job.last_error = err
+            if job.one_shot and self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+            if err is None:
+                job.failures = 0
+            else:
+                job.failures += 1
+                if not job.one_shot and self._jobs.get(job.name) is job and not job.paused:
+                    delay = min(max(job.interval_s, 1.0) * 2 ** job.failures,
+                                max(job.max_backoff_s, job.interval_s))
+                    self._push(job, time.monotonic() + self._jittered(delay, job.jitter))
+        if self.on_job_done:
+            try:
+                self.on_job_done(job, ms, err)
+            except Exception as e:
+                logger.debug(f"Job hook: {e}")
@@ -0,0 +1 @@
+"""core/logs - logging pipeline for agms.log"""
@@ -0,0 +1,197 @@
+"""
+core/logs/log_pipeline.py
+Non-blocking logging for agms.log
+  - callers (GUI, schedulers, sync threads) only enqueue: QueueHandler ->
+    QueueListener thread does formatting + console/file I/O
+  - agms.log rotates by size and at midnight; old files become agms.log.N.gz
+  - optional JSON lines (one object per record)
+  - repeated identical WARNINGs are rate-limited: the count of suppressed
+    copies is logged when the window ends (or at shutdown), errors never are
+"""
+import atexit, gzip, json, logging, os, queue, shutil, sys, threading, time
+from datetime import date, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts":     datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level":  record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg":    record.getMessage(),
+        }
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DailySizeRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that also rolls over when the date changes and
+    gzips rotated files (agms.log.1.gz ... agms.log.N.gz)."""
+
+    def __init__(self, filename, max_bytes: int, backup_count: int, encoding="utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.namer   = lambda name: name + ".gz"
+        self.rotator = self._gzip_rotate
+        try:
+            self._day = date.fromtimestamp(os.stat(filename).st_mtime)
+        except OSError:
+            self._day = date.today()
+
+    def shouldRollover(self, record) -> bool:
+        if date.today() != self._day and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self._day = date.today()
+
+    @staticmethod
+    def _gzip_rotate(source, dest):
+        with open(source, "rb") as fi, gzip.open(dest, "wb", compresslevel=6) as fo:
+            shutil.copyfileobj(fi, fo)
+        os.remove(source)
+
+
+class DedupFilter(logging.Filter):
+    """Drop identical WARNING records seen again within window_s seconds.
+    flush() reports each suppressed burst once its window is over (a summary
+    record handed to `sink`); ERROR/CRITICAL records are never dropped."""
+
+    def __init__(self, window_s: float = 60.0, level: int = logging.WARNING, sink=None):
+        super().__init__()
+        self.window_s, self.level, self.sink = window_s, level, sink
+        self._seen = {}                        # key -> [first_ts, suppressed]
+        self._lock = threading.Lock()
+
+    def _summary(self, key, n, window_s) -> logging.LogRecord:
+        name, levelno, msg = key
+        return logging.makeLogRecord({
+            "name": name, "levelno": levelno, "levelname": logging.getLevelName(levelno),
+            "msg": f"{msg} (repeated {n}x in last {window_s:.0f}s)"})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != self.level:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = record.created
+        with self._lock:
+            ent = self._seen.get(key)
+            if ent is not None and now - ent[0] < self.window_s:
+                ent[1] += 1
+                return False
+            suppressed = ent[1] if ent else 0
+            self._seen[key] = [now, 0]
+            if len(self._seen) > 2048:          # keep the table small
+                self._expire(now, force=False)
+        if suppressed:                          # window ended without a flush()
+            record.msg  = f"{record.getMessage()} (repeated {suppressed}x in last {self.window_s:.0f}s)"
+            record.args = None
+        return True
+
+    def _expire(self, now: float, force: bool) -> list:
+        """Drop finished windows; return summaries for the ones that
+        suppressed something (call with the lock held)."""
+        out = []
+        for key, (first, n) in list(self._seen.items()):
+            if force or now - first >= self.window_s:
+                del self._seen[key]
+                if n:
+                    out.append(self._summary(key, n, min(now - first, self.window_s)
+                                             if force else self.window_s))
+        return out
+
+    def flush(self, force: bool = False) -> list:
+        """Emit "repeated N x" summaries for expired windows (all windows if
+        force, e.g. at shutdown) to sink; returns them."""
+        with self._lock:
+            out = self._expire(time.time(), force)
+        if self.sink:
+            for rec in out:
+                self.sink(rec)
+        return out
+
+
+class _EnqueueHandler(QueueHandler):
+    """QueueHandler whose prepare() skips full formatting on the caller's
+    thread - only the message and traceback are resolved."""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg  = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+_dedup     = None
+_flush_stop = None
+
+
+def configure_logging(logs_dir: Path, level=logging.INFO, json_lines: bool = False,
+                      max_mb: float = 10, backups: int = 14, dedup_window_s: float = 60.0,
+                      console: bool = True) -> QueueListener:
+    """Install the queue-based pipeline on the root logger (idempotent)."""
+    global _listener, _dedup, _flush_stop
+    if _listener is not None:
+        return _listener
+    logs_dir = Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    fmt = JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    if console:
+        sh = logging.StreamHandler(sys.stdout)
+        sh.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(sh)
+    fh = DailySizeRotatingFileHandler(logs_dir / "agms.log", int(max_mb * 1024 * 1024), backups)
+    fh.setFormatter(fmt)
+    handlers.append(fh)
+
+    q  = queue.SimpleQueue()
+    qh = _EnqueueHandler(q)
+    _dedup = DedupFilter(dedup_window_s, sink=q.put)    # summaries skip the filter
+    qh.addFilter(_dedup)
+    root = logging.getLogger()
+    root.handlers[:] = [qh]
+    root.setLevel(level)
+
+    _listener = QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+    _flush_stop = threading.Event()
+    threading.Thread(target=_flush_loop, args=(_dedup, _flush_stop, max(1.0, dedup_window_s / 4)),
+                     name="agms-log-dedup", daemon=True).start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def _flush_loop(dedup: DedupFilter, stop: threading.Event, every_s: float):
+    while not stop.wait(every_s):
+        dedup.flush()
+
+
+def stop_logging():
+    """Report pending repeat counts, flush the queue and stop the writer
+    thread (safe to call twice)."""
+    global _listener, _dedup, _flush_stop
+    if _flush_stop is not None:
+        _flush_stop.set()
+        _flush_stop = None
+    if _dedup is not None:
+        _dedup.flush(force=True)
+        _dedup = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+_dedup     = None
+_flush_stop = None
@@ -0,0 +1 @@
+"""core/metrics - in-process counters, gauges and histograms (st.metrics)"""
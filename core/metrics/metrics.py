@@ -0,0 +1,276 @@
+"""
+core/metrics/metrics.py
+Low-overhead instrumentation (st.metrics) next to HealthMonitor's alerts
+  - Counter / Gauge / Histogram, optionally labelled (job=..., method=...)
+  - histograms use fixed log-scale ms buckets: observe() is a bisect + add,
+    lock-free under the GIL (a rare lost increment is fine; <1 us per timed call)
+  - snapshot() every rollup goes into a bounded ring buffer (time series)
+    and is appended to logs/metrics/metrics_YYYYMMDD.jsonl (instruments that
+    never fired are left out; day files older than keep_days are deleted)
+  - Prometheus text + JSON export (files, or serve() on 127.0.0.1)
+  - instrument_methods(obj) times every public method of an instance
+"""
+import bisect, functools, inspect, json, logging, math, threading, time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Metrics")
+
+# ms buckets: 0.1 ms .. 60 s (floats: bisect on a homogeneous tuple is faster)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0,
+                      500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0, 60000.0)
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _prom_num(v) -> str:
+    """Full-precision sample value (:g keeps 6 digits: 1234567 -> 1.23457e+06)."""
+    v = float(v)
+    if math.isfinite(v):
+        return repr(v)
+    return "NaN" if v != v else ("+Inf" if v > 0 else "-Inf")
+
+
+def _prom_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, n: float = 1.0):
+        self.value += n
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, v: float):
+        self.value = float(v)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total", "max")
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)       # last = +Inf
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def observe(self, v: float, _bisect=bisect.bisect_left):
+        self.counts[_bisect(self.bounds, v)] += 1
+        self.total += v
+        if v > self.max:
+            self.max = v
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Bucket-interpolated estimate (good enough for p50/p95/p99)."""
+        counts, mx = list(self.counts), self.max
+        n = sum(counts)
+        if not n:
+            return 0.0
+        rank, seen = q * n, 0
+        for i, c in enumerate(counts):
+            if seen + c >= rank and c:
+                lo = self.bounds[i - 1] if i else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else mx
+                return min(lo + (hi - lo) * (rank - seen) / c, mx)
+            seen += c
+        return mx
+
+
+class Metrics:
+    def __init__(self, out_dir: Path = None, ring_size: int = 1440, keep_days: int = 14):
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.keep_days = keep_days
+        self._pruned   = None                      # day of the last retention pass
+        self.ring    = deque(maxlen=ring_size)     # snapshots, oldest dropped
+        self._counters, self._gauges, self._hists = {}, {}, {}
+        self._lock   = threading.Lock()
+        self._server = None
+
+    # ── Instruments (cached: call sites may keep the returned object) ────────
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(self._counters, Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(self._gauges, Gauge, name, labels)
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        return self._get(self._hists, Histogram, name, labels)
+
+    def _get(self, store, cls, name, labels):
+        k = _key(name, labels)
+        m = store.get(k)
+        if m is None:
+            with self._lock:
+                m = store.setdefault(k, cls())
+        return m
+
+    def timed(self, name: str, **labels):
+        """Decorator: observe the call's duration (ms) in histogram `name`."""
+        observe, clock = self.histogram(name, **labels).observe, time.perf_counter
+
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                t = clock()
+                try:
+                    return fn(*a, **kw)
+                finally:
+                    observe((clock() - t) * 1000)
+            return wrapper
+        return deco
+
+    def instrument_methods(self, obj, metric: str, label: str = "method", names=None) -> int:
+        """Shadow obj's public methods with timed wrappers (instance attributes
+        only - the class and isinstance() checks are untouched)."""
+        n = 0
+        for attr, fn in inspect.getmembers(type(obj), inspect.isfunction):
+            if attr.startswith("_") or (names is not None and attr not in names):
+                continue
+            setattr(obj, attr, self.timed(metric, **{label: attr})(getattr(obj, attr)))
+            n += 1
+        return n
+
+    # ── Snapshots / rollups ──────────────────────────────────────────────────
+    def snapshot(self, skip_empty: bool = False) -> dict:
+        """skip_empty drops zero counters and histograms with no observations
+        (e.g. instrument_methods() entries for DB methods never called)."""
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges   = list(self._gauges.items())
+            hists    = list(self._hists.items())
+        if skip_empty:
+            counters = [kv for kv in counters if kv[1].value]
+            hists    = [kv for kv in hists if kv[1].count]
+        fmt = lambda k: k[0] + _prom_labels(k[1])
+        return {
+            "ts":       round(time.time(), 3),
+            "counters": {fmt(k): c.value for k, c in counters},
+            "gauges":   {fmt(k): g.value for k, g in gauges},
+            "histograms": {fmt(k): {"count": h.count, "sum": round(h.total, 3),
+                                    "max": round(h.max, 3),
+                                    "p50": round(h.quantile(0.50), 3),
+                                    "p95": round(h.quantile(0.95), 3),
+                                    "p99": round(h.quantile(0.99), 3)}
+                           for k, h in hists},
+        }
+
+    def rollup(self) -> dict:
+        """Take a snapshot into the ring buffer and persist it + the exports."""
+        snap = self.snapshot(skip_empty=True)
+        self.ring.append(snap)
+        if self.out_dir:
+            try:
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                day = datetime.now().strftime("%Y%m%d")
+                if day != self._pruned:
+                    self._prune(day)
+                with open(self.out_dir / f"metrics_{day}.jsonl", "a", encoding="utf-8") as f:
+                    f.write(json.dumps(snap, separators=(",", ":")) + "\n")
+                (self.out_dir / "metrics.prom").write_text(self.to_prometheus(), encoding="utf-8")
+                (self.out_dir / "metrics.json").write_text(json.dumps(snap, indent=1), encoding="utf-8")
+            except OSError as e:
+                logger.debug(f"Metrics rollup: {e}")
+        return snap
+
+    def _prune(self, day: str):
+        """Delete metrics_YYYYMMDD.jsonl files older than keep_days."""
+        self._pruned = day
+        cutoff = (datetime.now() - timedelta(days=self.keep_days)).strftime("%Y%m%d")
+        for f in self.out_dir.glob("metrics_*.jsonl"):
+            stamp = f.stem[len("metrics_"):]
+            if stamp.isdigit() and stamp < cutoff:
+                try:
+                    f.unlink()
+                except OSError as e:
+                    logger.debug(f"Metrics retention: {e}")
+
+    # ── Export ───────────────────────────────────────────────────────────────
+    def to_prometheus(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges   = sorted(self._gauges.items())
+            hists    = sorted(self._hists.items(), key=lambda kv: kv[0])
+        out, typed = [], set()
+
+        def _type(name, kind):
+            if name not in typed:
+                typed.add(name)
+                out.append(f"# TYPE agms_{name} {kind}")
+
+        for (name, labels), c in counters:
+            _type(name, "counter")
+            out.append(f"agms_{name}{_prom_labels(labels)} {_prom_num(c.value)}")
+        for (name, labels), g in gauges:
+            _type(name, "gauge")
+            out.append(f"agms_{name}{_prom_labels(labels)} {_prom_num(g.value)}")
+        for (name, labels), h in hists:
+            _type(name, "histogram")
+            counts, total = list(h.counts), h.total
+            n = sum(counts)
+            cum = 0
+            for bound, c in zip(list(h.bounds) + ["+Inf"], counts):
+                cum += c
+                lb = _prom_labels(labels + (("le", bound),))
+                out.append(f"agms_{name}_bucket{lb} {cum}")
+            out.append(f"agms_{name}_sum{_prom_labels(labels)} {_prom_num(total)}")
+            out.append(f"agms_{name}_count{_prom_labels(labels)} {n}")
+        return "\n".join(out) + "\n"
+
+    def to_json(self, history: bool = False) -> str:
+        data = self.snapshot()
+        if history:
+            data["history"] = list(self.ring)
+        return json.dumps(data)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /metrics.json on a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, ctype = metrics.to_json(history="history" in self.path), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, ctype = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404); return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *a):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=self._server.serve_forever, name="agms-metrics",
+                         daemon=True).start()
+        logger.info(f"Metrics export on http://{host}:{port}/metrics")
+        return self._server
+
+    def close(self):
+        if self._server:
+            self._server.shutdown()
+            self._server = None
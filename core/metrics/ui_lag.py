@@ -0,0 +1,49 @@
+"""
+core/metrics/ui_lag.py
+Qt event-loop lag probe: a QTimer heartbeat on the GUI thread; how late each
+tick fires is the time the loop was busy (ui_loop_lag_ms histogram).
+busy() feeds JobScheduler.busy_probe so heavy jobs wait while the UI works;
+last_beat is the heartbeat MainThreadWatchdog (core/metrics/watchdog.py) watches.
+"""
+import time
+
+BUSY_LAG_MS = 100.0
+
+
+class UiLagProbe:
+    def __init__(self, metrics, interval_ms: int = 250):
+        from PySide6.QtCore import QTimer
+        self.hist     = metrics.histogram("ui_loop_lag_ms")
+        self.last_lag = metrics.gauge("ui_loop_lag_last_ms")
+        self.interval = interval_ms / 1000
+        self._last    = None
+        self._timer   = QTimer()
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    @property
+    def last_beat(self):
+        """perf_counter() of the last heartbeat (None before start)."""
+        return self._last
+
+    def busy(self) -> bool:
+        """True if the last tick was late or the loop is blocked right now.
+        Safe to call from any thread."""
+        if self._last is None:
+            return False
+        overdue = (time.perf_counter() - self._last - self.interval) * 1000
+        return self.last_lag.value >= BUSY_LAG_MS or overdue >= BUSY_LAG_MS
+
+    def _tick(self):
+        now = time.perf_counter()
+        lag = max(0.0, now - self._last - self.interval) * 1000
+        self._last = now
+        self.hist.observe(lag)
+        self.last_lag.set(lag)
@@ -0,0 +1,114 @@
+"""
+core/metrics/watchdog.py
+Main-thread blocking watchdog.
+  - UiLagProbe's QTimer heartbeat (posted into app.exec()) marks the loop alive
+  - a helper thread notices when no beat arrived for threshold_ms, grabs the
+    GUI thread's Python stack (sys._current_frames) and writes
+    logs/stalls/stall_<ts>.log next to logs/crashes/
+  - the stack is classified (DB call, WhatsApp, notification popup ...) so
+    synchronous work can be found and moved off the GUI thread
+"""
+import logging, sys, threading, time, traceback
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Watchdog")
+
+# (path fragment, subsystem). App code is matched first (innermost app frame
+# wins), then libraries, then the generic network stack: a WhatsApp send that
+# blocks in socket.py under selenium is still "WhatsApp", not "network".
+APP_SUBSYSTEMS = (
+    ("database/",                    "DB call"),
+    ("modules/whatsapp_engine/",     "WhatsApp"),
+    ("core/notifications/",          "notification popup"),
+    ("core/cloud/",                  "Firebase sync"),
+    ("modules/cloud_sync/",          "cloud sync"),
+    ("core/recovery/",               "backup / recovery"),
+    ("core/updater/",                "updater"),
+    ("modules/",                     "module"),
+)
+LIB_SUBSYSTEMS = (
+    ("sqlite3",                      "DB call"),
+    ("selenium",                     "WhatsApp"),
+    ("firebase_admin",               "Firebase sync"),
+    ("easyocr",                      "OCR"),
+    ("reportlab",                    "PDF report"),
+    ("openpyxl",                     "Excel"),
+)
+NET_SUBSYSTEMS = (
+    ("requests/",                    "network"),
+    ("urllib3",                      "network"),
+    ("socket.py",                    "network"),
+    ("ssl.py",                       "network"),
+)
+SUBSYSTEMS = APP_SUBSYSTEMS + LIB_SUBSYSTEMS + NET_SUBSYSTEMS
+
+
+def classify(frames) -> str:
+    """Subsystem of the innermost recognised app frame, else library frame,
+    else network frame ('unknown' otherwise)."""
+    paths = [fs.filename.replace("\\", "/") for fs in reversed(frames)]
+    for table in (APP_SUBSYSTEMS, LIB_SUBSYSTEMS, NET_SUBSYSTEMS):
+        for path in paths:
+            for frag, name in table:
+                if frag in path:
+                    return name
+    return "unknown"
+
+
+class MainThreadWatchdog:
+    def __init__(self, probe, out_dir: Path, threshold_ms: float = 2000.0,
+                 metrics=None, poll_s: float = 0.25):
+        self.probe        = probe              # UiLagProbe (heartbeat source)
+        self.out_dir      = Path(out_dir)
+        self.threshold_ms = threshold_ms
+        self.metrics      = metrics
+        self.poll_s       = poll_s
+        self.main_ident   = threading.main_thread().ident
+        self._stop        = threading.Event()
+        self._thread      = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="agms-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        stalled_at = None               # beat timestamp of the current stall
+        subsystem  = ""
+        while not self._stop.wait(self.poll_s):
+            beat = self.probe.last_beat
+            if beat is None:
+                continue
+            blocked_ms = (time.perf_counter() - beat - self.probe.interval) * 1000
+            if blocked_ms >= self.threshold_ms and stalled_at != beat:
+                stalled_at = beat
+                subsystem  = self._dump(blocked_ms)
+            elif stalled_at is not None and beat != stalled_at:
+                total = (beat - stalled_at - self.probe.interval) * 1000
+                logger.warning(f"GUI thread unblocked after {total:.0f} ms [{subsystem}]")
+                if self.metrics:
+                    self.metrics.histogram("ui_stall_ms", subsystem=subsystem).observe(total)
+                stalled_at = None
+
+    def _dump(self, blocked_ms: float) -> str:
+        frame = sys._current_frames().get(self.main_ident)
+        if frame is None:
+            return "unknown"
+        frames    = traceback.extract_stack(frame)
+        subsystem = classify(frames)
+        stack     = "".join(traceback.format_list(frames))
+        logger.warning(f"GUI thread blocked for {blocked_ms:.0f} ms in {subsystem}:\n{stack}")
+        if self.metrics:
+            self.metrics.counter("ui_stalls_total", subsystem=subsystem).inc()
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            f = self.out_dir / f"stall_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+            f.write_text(f"GUI thread blocked >= {blocked_ms:.0f} ms\n"
+                         f"Subsystem: {subsystem}\n\n{stack}", encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"Stall dump: {e}")
+        return subsystem
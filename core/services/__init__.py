@@ -0,0 +1 @@
+"""core/services - lazily constructed optional subsystems (st.services)"""
@@ -0,0 +1,210 @@
+"""
+core/services/service_registry.py
+Lazy registry for heavy optional subsystems (WhatsApp/Selenium, Firebase,
+cloud sync, automation, web dashboard), hung off AppState as st.services.
+  - a subsystem is imported + constructed on first st.services.get(name)
+  - FeatureFlags are honoured: a disabled feature is never imported (services
+    whose flag FeatureFlags does not define are always enabled)
+  - LazyService proxies can be handed to code that expects the real object
+  - optional background warm-up once the UI is idle (skipped on low-RAM PCs)
+  - a service is loaded in two steps: its `imports` (the slow part: Selenium,
+    firebase_admin ...) run on whichever thread asks, construction runs on one
+    thread - the GUI thread for gui=True services once post_to_main is set,
+    so QObject-based services always get GUI-thread affinity; a worker asking
+    for one waits (GUI_BUILD_TIMEOUT_S) while the GUI thread builds it
+"""
+import importlib, logging, threading, time
+
+logger = logging.getLogger("AGMS.Services")
+
+GUI_BUILD_TIMEOUT_S = 30.0
+
+
+class _Entry:
+    __slots__ = ("name", "factory", "flag", "warm", "gui", "imports", "lock", "instance",
+                 "loaded", "error", "load_ms", "import_ms")
+
+    def __init__(self, name, factory, flag, warm, gui, imports):
+        self.name, self.factory, self.flag, self.warm = name, factory, flag, warm
+        self.gui, self.imports = gui, tuple(imports)
+        self.lock     = threading.Lock()
+        self.instance = None
+        self.loaded   = False
+        self.error    = None
+        self.load_ms  = 0.0
+        self.import_ms = 0.0
+
+
+class ServiceRegistry:
+    def __init__(self, flags=None):
+        self.flags    = flags            # FeatureFlags (core.feature_flags) or None
+        self.post_to_main = None         # fn(callable) -> runs it on the GUI thread
+        self._entries = {}
+
+    def register(self, name: str, factory, flag: str = None, warm: bool = False,
+                 gui: bool = False, imports=()):
+        """factory() -> service. `flag` defaults to the service name.
+        imports: modules factory needs, imported first on the calling thread.
+        gui: construct on the GUI thread (QObject / QTimer owners)."""
+        self._entries[name] = _Entry(name, factory, flag or name, warm, gui, imports)
+
+    def names(self) -> list:
+        return list(self._entries)
+
+    def is_enabled(self, name: str) -> bool:
+        e = self._entries.get(name)
+        if e is None:
+            return False
+        if self.flags is None:
+            return True
+        try:
+            known = self.flags.get_all()
+            if e.flag not in known:                  # no such flag: never gate on a guess
+                return True
+            if hasattr(self.flags, "is_enabled"):
+                return bool(self.flags.is_enabled(e.flag))
+            val = known[e.flag]
+            return bool(val.get("enabled", True) if isinstance(val, dict) else val)
+        except Exception as ex:
+            logger.debug(f"Flag '{e.flag}': {ex}")
+            return True
+
+    def loaded(self, name: str) -> bool:
+        e = self._entries.get(name)
+        return bool(e and e.loaded)
+
+    def get(self, name: str):
+        """The service instance, constructing it on first use.
+        None if unknown, disabled by a feature flag, or construction failed.
+        Off the GUI thread a gui=True service is built by the GUI thread while
+        this caller waits - never call it from code the GUI thread waits on."""
+        e = self._entries.get(name)
+        if e is None or not self.is_enabled(name):
+            return None
+        if e.loaded:
+            return e.instance
+        if not self._import(e):
+            return e.instance
+        post = self.post_to_main
+        if e.gui and post is not None and threading.current_thread() is not threading.main_thread():
+            done = threading.Event()
+
+            def _on_main():
+                try:
+                    self._build(e)
+                finally:
+                    done.set()
+
+            post(_on_main)
+            if not done.wait(GUI_BUILD_TIMEOUT_S):
+                logger.warning(f"{name}: GUI thread did not build it within "
+                               f"{GUI_BUILD_TIMEOUT_S:.0f}s")
+                return None
+        else:
+            self._build(e)
+        return e.instance
+
+    def _import(self, e: _Entry) -> bool:
+        """Run the import step on the calling thread. False if it failed (the
+        entry is then marked loaded with the error)."""
+        if not e.imports or e.import_ms:
+            return True
+        t = time.perf_counter()
+        try:
+            for mod in e.imports:
+                importlib.import_module(mod)
+        except Exception as ex:
+            with e.lock:
+                if not e.loaded:
+                    e.error, e.loaded = ex, True
+                    logger.warning(f"{e.name}: {ex}")
+            return False
+        e.import_ms = max((time.perf_counter() - t) * 1000, 0.001)
+        return True
+
+    def _build(self, e: _Entry):
+        with e.lock:
+            if e.loaded:
+                return
+            t = time.perf_counter()
+            try:
+                e.instance = e.factory()
+            except Exception as ex:
+                e.error = ex
+                logger.warning(f"{e.name}: {ex}")
+            e.load_ms = (time.perf_counter() - t) * 1000
+            e.loaded  = True
+            logger.info(f"Service {e.name} loaded in {e.import_ms + e.load_ms:.0f} ms "
+                        f"({e.load_ms:.0f} ms construction, {threading.current_thread().name})")
+
+    def proxy(self, name: str) -> "LazyService":
+        return LazyService(self, name)
+
+    def stats(self) -> dict:
+        return {n: {"enabled": self.is_enabled(n), "loaded": e.loaded,
+                    "import_ms": round(e.import_ms, 1), "load_ms": round(e.load_ms, 1),
+                    "error": str(e.error) if e.error else None}
+                for n, e in self._entries.items()}
+
+    # ── Warm-up ──────────────────────────────────────────────────────────────
+    def warm_up(self, delay_s: float = 30.0, min_ram_gb: float = 6.0, jobs=None):
+        """Load warm=True services after delay_s as a heavy one-shot job on
+        `jobs` (JobScheduler) or a helper thread: imports run there, only
+        construction of gui=True services is handed to the GUI thread.
+        Skipped on machines with less than min_ram_gb RAM - they load on use."""
+        try:
+            import psutil
+            ram_gb = psutil.virtual_memory().total / 1024 ** 3
+        except Exception:
+            ram_gb = None
+        if ram_gb is not None and ram_gb < min_ram_gb:
+            logger.info(f"Service warm-up skipped ({ram_gb:.1f} GB RAM)")
+            return None
+        names = [n for n, e in self._entries.items() if e.warm]
+
+        def _load():
+            for n in names:
+                self.get(n)
+
+        if jobs is not None:
+            return jobs.run_once("service_warmup", _load, delay_s=delay_s, heavy=True)
+
+        def _run():
+            time.sleep(delay_s)
+            _load()
+
+        th = threading.Thread(target=_run, name="agms-service-warmup", daemon=True)
+        th.start()
+        return th
+
+
+class LazyService:
+    """Stand-in that constructs the real service on first attribute access.
+    Truth testing loads it too, so `if wa_manager:` guards behave as they did
+    with a plain object-or-None (False when disabled or construction failed).
+    Loading goes through ServiceRegistry.get(), so the construction thread
+    rules above hold whichever thread touches the proxy first."""
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def _target(self):
+        svc = self._registry.get(self._name)
+        if svc is None:
+            raise AttributeError(f"Service '{self._name}' is disabled or failed to load")
+        return svc
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._target(), attr, value)
+
+    def __bool__(self):
+        return self._registry.get(self._name) is not None
+
+    def __repr__(self):
+        state = "loaded" if self._registry.loaded(self._name) else "lazy"
+        return f"<LazyService {self._name} ({state})>"
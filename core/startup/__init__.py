@@ -0,0 +1 @@
+"""core/startup - boot scheduling and startup instrumentation for main.main()"""
@@ -0,0 +1,172 @@
+"""
+core/startup/assets.py
+Startup asset cache for the "theme" boot stage
+  - the stylesheet is minified once (comments/whitespace dropped, url(...)
+    made absolute, font-family lists narrowed to the first installed family)
+    and stored as data/theme.min.qss
+  - the UI font family is resolved once against QFontDatabase ("Segoe UI" is
+    missing on Linux -> fontconfig fallback search on every QFont) and
+    remembered in data/asset_cache.json
+  - both are rebuilt when theme.qss, the platform, the Qt version or the
+    installed font set (mtimes of the font / fontconfig cache dirs) changes
+"""
+import hashlib, json, logging, os, platform, re, sys
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Assets")
+
+CACHE_VERSION = 2                # bump when minify_qss output changes
+UI_FONTS      = ("Segoe UI", "Inter", "Ubuntu", "Noto Sans", "Cantarell",
+                 "DejaVu Sans", "Liberation Sans", "Arial")
+GENERIC       = {"sans-serif", "serif", "monospace", "cursive", "fantasy"}
+
+_TOKENS  = re.compile(r"""(/\*.*?\*/)|("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')""", re.S)
+_URL     = re.compile(r"url\(\s*(['\"]?)([^)'\"]+)\1\s*\)")
+_FAMILY  = re.compile(r"font-family\s*:\s*([^;}]+)")
+
+
+def _squeeze(code: str) -> str:
+    code = re.sub(r"\s+", " ", code)
+    code = re.sub(r"\s*([{};,>])\s*", r"\1", code)
+    return re.sub(r":\s+", ":", code)
+
+
+def minify_qss(text: str, base_dir: Path) -> str:
+    """Strip comments/whitespace and make url(...) paths absolute (Qt would
+    otherwise resolve them against the working directory). Quoted strings,
+    e.g. QLabel[text="a  b"], are copied verbatim."""
+    def _abs(m):
+        ref = m.group(2).strip()
+        if not (ref.startswith(":") or re.match(r"^[a-zA-Z][\w+.-]*:", ref) or Path(ref).is_absolute()):
+            ref = (Path(base_dir) / ref).resolve().as_posix()
+        return f'url("{ref}")'
+
+    text = _URL.sub(_abs, text)
+    out, pos = [], 0
+    for m in _TOKENS.finditer(text):
+        out.append(_squeeze(text[pos:m.start()]))
+        if m.group(2):                      # string literal: keep; comment: drop
+            out.append(m.group(2))
+        pos = m.end()
+    out.append(_squeeze(text[pos:]))
+    return "".join(out).replace(";}", "}").strip()
+
+
+def narrow_families(text: str, available) -> str:
+    """font-family: "Segoe UI","Inter",sans-serif -> the first installed one."""
+    def _pick(m):
+        names = [n.strip().strip("'\"") for n in m.group(1).split(",")]
+        for n in names:
+            if n in available:
+                return f'font-family:"{n}"'
+        return m.group(0)
+    return _FAMILY.sub(_pick, text)
+
+
+def _font_dirs() -> list:
+    home = Path.home()
+    if sys.platform == "win32":
+        return [Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts",
+                Path(os.environ.get("LOCALAPPDATA", home)) / "Microsoft" / "Windows" / "Fonts"]
+    if sys.platform == "darwin":
+        return [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library" / "Fonts"]
+    return [Path("/usr/share/fonts"), Path("/usr/local/share/fonts"),
+            home / ".local" / "share" / "fonts", home / ".fonts",
+            Path("/var/cache/fontconfig"), home / ".cache" / "fontconfig"]
+
+
+def font_fingerprint(dirs=None) -> str:
+    """Cheap stand-in for "the installed font set": mtimes of the font dirs
+    and their direct subdirs (installing a font touches one of them)."""
+    h = hashlib.sha1()
+    for d in (_font_dirs() if dirs is None else dirs):
+        try:
+            h.update(f"{d}:{d.stat().st_mtime_ns}".encode())
+            with os.scandir(d) as it:
+                for ent in sorted(it, key=lambda e: e.name):
+                    if ent.is_dir(follow_symlinks=False):
+                        h.update(f"{ent.name}:{ent.stat().st_mtime_ns}".encode())
+        except OSError:
+            continue
+    return h.hexdigest()[:12]
+
+
+def _qt_version() -> str:
+    try:
+        from PySide6.QtCore import qVersion
+        return qVersion()
+    except Exception:
+        return ""
+
+
+class AssetCache:
+    def __init__(self, cache_dir: Path):
+        self.dir   = Path(cache_dir)
+        self.index = self.dir / "asset_cache.json"
+        self.qss   = self.dir / "theme.min.qss"
+        self._data = self._load()
+        self._env  = (f"{CACHE_VERSION}|{platform.system()}|{platform.release()}|"
+                      f"{_qt_version()}|{font_fingerprint()}")
+        self._families = None
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.index.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _save(self):
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self.index.write_text(json.dumps(self._data, indent=1), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"Asset cache save: {e}")
+
+    def _available(self) -> set:
+        """Installed families - only queried on a cache miss (it is the slow part)."""
+        if self._families is None:
+            from PySide6.QtGui import QFontDatabase
+            self._families = set(QFontDatabase.families())
+        return self._families
+
+    # ── Font ─────────────────────────────────────────────────────────────────
+    def font_family(self, preferred=UI_FONTS) -> str:
+        ent = self._data.get("font") or {}
+        if ent.get("env") == self._env and ent.get("preferred") == list(preferred):
+            return ent["family"]
+        avail  = self._available()
+        family = next((f for f in preferred if f in avail), None)
+        if family is None:
+            from PySide6.QtGui import QFontDatabase
+            family = QFontDatabase.systemFont(QFontDatabase.SystemFont.GeneralFont).family()
+        self._data["font"] = {"env": self._env, "preferred": list(preferred), "family": family}
+        self._save()
+        logger.info(f"UI font resolved: {family}")
+        return family
+
+    # ── Stylesheet ───────────────────────────────────────────────────────────
+    def stylesheet(self, src: Path):
+        """Minified, pre-resolved stylesheet for src (None if src is missing)."""
+        src = Path(src)
+        try:
+            st = src.stat()
+        except OSError:
+            return None
+        key = {"src": str(src.resolve()), "size": st.st_size,
+               "mtime_ns": st.st_mtime_ns, "env": self._env}
+        if self._data.get("qss") == key:
+            try:
+                return self.qss.read_text(encoding="utf-8")
+            except OSError:
+                pass
+        raw = src.read_text(encoding="utf-8")
+        out = narrow_families(minify_qss(raw, src.parent), self._available())
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self.qss.write_text(out, encoding="utf-8")
+            self._data["qss"] = key
+            self._save()
+        except OSError as e:
+            logger.debug(f"Asset cache: {e}")
+        logger.info(f"Stylesheet compiled: {len(raw)} -> {len(out)} bytes")
+        return out
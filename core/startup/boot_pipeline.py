@@ -0,0 +1,261 @@
+"""
+core/startup/boot_pipeline.py
+Dependency-aware boot scheduler used by main.main()
+  - every stage declares the stages it needs (enc -> db -> state -> migrations ...)
+  - independent stages run concurrently on a small worker pool
+  - Qt-bound stages (QApplication, AppState, MainWindow...) run on the GUI thread
+  - stages are grouped in phases: "boot" blocks the UI, later phases don't
+  - per-stage timings go to the AGMS.Boot logger (agms.log)
+"""
+import logging, queue, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("AGMS.Boot")
+
+MAIN, WORKER = "main", "worker"
+PENDING, RUNNING, DONE, FAILED, SKIPPED = "pending", "running", "done", "failed", "skipped"
+_FINISHED = (DONE, FAILED, SKIPPED)
+
+
+class BootError(RuntimeError):
+    """Raised by BootPipeline.run() when a required stage failed or was skipped."""
+
+    def __init__(self, stage: str, error):
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    __slots__ = ("name", "fn", "deps", "after", "phase", "thread", "required",
+                 "log_level", "label", "status", "error", "started", "elapsed_ms",
+                 "thread_name")
+
+    def __init__(self, name, fn, deps, after, phase, thread, required, log_level, label=""):
+        self.name, self.fn, self.phase, self.thread = name, fn, phase, thread
+        self.label = label or name
+        self.deps, self.after = tuple(deps), tuple(after)
+        self.required, self.log_level = required, log_level
+        self.status, self.error = PENDING, None
+        self.started, self.elapsed_ms, self.thread_name = None, 0.0, ""
+
+
+class BootPipeline:
+    """
+    Usage:
+        boot = BootPipeline()
+
+        @boot.stage("db", deps=("enc",), required=True)
+        def _db(ctx): return DatabaseManager(ctx["enc"])
+
+        boot.run("boot")                 # blocks until the phase is finished
+        boot.start("post_show", invoker) # returns at once, GUI stages go via invoker
+
+    A stage receives the shared ctx dict; a non-None return value is stored
+    as ctx[<stage name>].  `deps` are hard dependencies (a failed dep skips
+    the stage), `after` only orders the stage and never skips it.
+    """
+
+    def __init__(self, max_workers: int = 4, on_event=None, on_phase=None):
+        self.ctx      = {}
+        self._listeners = [on_event] if on_event else []   # fn(name, status, stage) - any thread
+        self.on_phase = on_phase          # fn(phase, wall_ms) - any thread
+        self._stages  = {}
+        self._drivers = {}                # phase -> (run_main, wake)
+        self._lock    = threading.RLock()
+        self._pool    = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="agms-boot")
+        self._t0      = time.perf_counter()
+        self._phase_t0 = {}
+
+    # ── Registration ─────────────────────────────────────────────────────────
+    def stage(self, name: str, deps=(), after=(), phase: str = "boot",
+              thread: str = WORKER, required: bool = False,
+              log_level: int = logging.WARNING, label: str = ""):
+        def deco(fn):
+            self.add(name, fn, deps, after, phase, thread, required, log_level, label)
+            return fn
+        return deco
+
+    def add_listener(self, fn):
+        """Subscribe fn(stage_name, status, stage) to stage events (any thread)."""
+        self._listeners.append(fn)
+
+    def stages(self, phase: str) -> list:
+        return self._phase(phase)
+
+    def add(self, name, fn, deps=(), after=(), phase="boot", thread=WORKER,
+            required=False, log_level=logging.WARNING, label=""):
+        if name in self._stages:
+            raise ValueError(f"Boot stage '{name}' registered twice")
+        if thread not in (MAIN, WORKER):
+            raise ValueError(f"Boot stage '{name}': unknown thread '{thread}'")
+        self._stages[name] = Stage(name, fn, deps, after, phase, thread,
+                                   required, log_level, label)
+
+    # ── Execution ────────────────────────────────────────────────────────────
+    def run(self, phase: str, on_idle=None):
+        """Run a phase on the calling (GUI) thread until every stage finished.
+        on_idle() is called between stages, e.g. to keep a splash painted."""
+        mainq = queue.Queue()
+        self._begin(phase, mainq.put, lambda: mainq.put(None))
+        while not self.phase_done(phase):
+            try:
+                job = mainq.get(timeout=0.05)
+            except queue.Empty:
+                job = None
+            if job is not None:
+                job()
+            if on_idle:
+                on_idle()
+        for s in self._phase(phase):
+            if s.required and s.status != DONE:
+                raise BootError(s.name, s.error or "skipped (dependency failed)")
+
+    def start(self, phase: str, post_to_main):
+        """Start a phase without blocking. post_to_main(fn) must run fn on the
+        GUI thread (see main_thread_invoker)."""
+        self._begin(phase, post_to_main, None)
+
+    def phase_done(self, phase: str) -> bool:
+        with self._lock:
+            return all(s.status in _FINISHED for s in self._phase(phase))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def timings(self) -> list:
+        with self._lock:
+            return [{
+                "stage":      s.name,
+                "phase":      s.phase,
+                "thread":     s.thread_name or s.thread,
+                "status":     s.status,
+                "deps":       list(s.deps + s.after),
+                "start_ms":   round((s.started - self._t0) * 1000, 2) if s.started else None,
+                "elapsed_ms": round(s.elapsed_ms, 2),
+            } for s in self._stages.values()]
+
+    # ── Internals ────────────────────────────────────────────────────────────
+    def _phase(self, phase):
+        return [s for s in self._stages.values() if s.phase == phase]
+
+    def _begin(self, phase, run_main, wake):
+        stages = self._phase(phase)
+        for s in stages:
+            for d in s.deps + s.after:
+                dep = self._stages.get(d)
+                if dep is None:
+                    raise ValueError(f"Boot stage '{s.name}' depends on unknown stage '{d}'")
+                if dep.phase != phase and dep.status not in _FINISHED:
+                    raise ValueError(f"Boot stage '{s.name}' ({phase}) depends on "
+                                     f"unfinished stage '{d}' ({dep.phase})")
+        order, todo = set(), {s.name for s in stages}
+        while todo:
+            ready = {n for n in todo
+                     if all(d in order or self._stages[d].phase != phase
+                            for d in self._stages[n].deps + self._stages[n].after)}
+            if not ready:
+                raise ValueError(f"Boot stages form a dependency cycle: {sorted(todo)}")
+            order |= ready
+            todo  -= ready
+        with self._lock:
+            self._drivers[phase] = (run_main, wake)
+            self._phase_t0[phase] = time.perf_counter()
+        self._dispatch(phase)
+
+    def _dispatch(self, phase):
+        run_main, wake = self._drivers[phase]
+        launch = []
+        with self._lock:
+            changed = True
+            while changed:
+                changed = False
+                for s in self._phase(phase):
+                    if s.status != PENDING:
+                        continue
+                    hard = [self._stages[d].status for d in s.deps]
+                    soft = [self._stages[d].status for d in s.after]
+                    if any(st in (FAILED, SKIPPED) for st in hard):
+                        s.status = SKIPPED
+                        logger.log(s.log_level, f"{s.name}: skipped (dependency failed)")
+                        self._emit(s)
+                        changed = True
+                    elif all(st == DONE for st in hard) and all(st in _FINISHED for st in soft):
+                        s.status = RUNNING
+                        launch.append(s)
+        for s in launch:
+            if s.thread == MAIN:
+                run_main(lambda s=s: self._run(s))
+            else:
+                self._pool.submit(self._run, s)
+        if self.phase_done(phase):
+            self._finish_phase(phase)
+
+    def _run(self, s: Stage):
+        s.thread_name = threading.current_thread().name
+        s.started = time.perf_counter()
+        self._emit(s)
+        status = FAILED
+        try:
+            result = s.fn(self.ctx)
+            if result is not None:
+                self.ctx[s.name] = result
+            status = DONE
+        except Exception as e:
+            s.error = e
+            logger.log(s.log_level, f"{s.name}: {e}")
+        finally:
+            s.elapsed_ms = (time.perf_counter() - s.started) * 1000
+            with self._lock:
+                s.status = status
+            logger.info(f"Boot stage {s.name}: {s.elapsed_ms:.1f} ms "
+                        f"[{s.status}, {s.thread_name}]")
+            self._emit(s)
+        self._dispatch(s.phase)
+        wake = self._drivers[s.phase][1]
+        if wake:
+            wake()
+
+    def _finish_phase(self, phase):
+        with self._lock:
+            t0 = self._phase_t0.pop(phase, None)
+        if t0 is None:
+            return
+        stages = self._phase(phase)
+        wall   = (time.perf_counter() - t0) * 1000
+        serial = sum(s.elapsed_ms for s in stages)
+        logger.info(f"Boot phase '{phase}': {wall:.1f} ms wall, "
+                    f"{serial:.1f} ms serial, {len(stages)} stages")
+        if self.on_phase:
+            try:
+                self.on_phase(phase, wall)
+            except Exception as e:
+                logger.debug(f"Boot phase handler: {e}")
+
+    def _emit(self, s: Stage):
+        for fn in self._listeners:
+            try:
+                fn(s.name, s.status, s)
+            except Exception as e:
+                logger.debug(f"Boot event handler: {e}")
+
+
+def main_thread_invoker():
+    """Return post_to_main(fn) that runs fn on the Qt GUI thread.
+    Must be called on the GUI thread after QApplication exists."""
+    from PySide6.QtCore import QObject, Signal, Slot, Qt
+
+    class _Invoker(QObject):
+        call = Signal(object)
+
+        def __init__(self):
+            super().__init__()
+            self.call.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+        @Slot(object)
+        def _run(self, fn):
+            fn()
+
+    inv = _Invoker()
+    return lambda fn, _inv=inv: _inv.call.emit(fn)    # closure keeps inv alive
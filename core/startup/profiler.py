@@ -0,0 +1,132 @@
+"""
+core/startup/profiler.py
+Startup profiler for `main.py --profile-startup` / `launcher.py --profile-startup`
+  - times every import (builtins.__import__ hook) and charges it to the
+    boot stage running on that thread ("<module>" outside any stage)
+  - splits each stage's wall-clock into import_ms + run_ms
+  - milestones (boot done, login shown, window shown ...) relative to process start;
+    "interactive" = first event-loop tick after window.show() (time-to-interactive)
+  - writes a JSON report into LOGS_DIR/startup/
+"""
+import builtins, json, logging, os, platform, sys, threading, time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Profiler")
+
+OUTSIDE = "<module>"
+
+
+class StartupProfiler:
+    _active = None
+
+    def __init__(self):
+        self.t0          = time.perf_counter()
+        self.started     = datetime.now()
+        self.milestones  = {}
+        self.extra       = {}             # e.g. launcher timings
+        self._stage_imp  = {}             # stage -> import ms
+        self._modules    = {}             # module -> (ms, stage)
+        self._tls        = threading.local()
+        self._lock       = threading.Lock()
+        self._orig_import = None
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+    @classmethod
+    def install(cls) -> "StartupProfiler":
+        """Create (once) and hook the import machinery."""
+        if cls._active is None:
+            prof = cls()
+            prof._orig_import = builtins.__import__
+            builtins.__import__ = prof._timed_import
+            cls._active = prof
+        return cls._active
+
+    @classmethod
+    def active(cls):
+        return cls._active
+
+    def uninstall(self):
+        if self._orig_import is not None and builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._orig_import
+        StartupProfiler._active = None
+
+    # ── Hooks ────────────────────────────────────────────────────────────────
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        tls = self._tls
+        if getattr(tls, "depth", 0) or (level == 0 and name in sys.modules):
+            tls.depth = getattr(tls, "depth", 0) + 1
+            try:
+                return self._orig_import(name, globals, locals, fromlist, level)
+            finally:
+                tls.depth -= 1
+        tls.depth = 1
+        t = time.perf_counter()
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            tls.depth = 0
+            ms    = (time.perf_counter() - t) * 1000
+            stage = getattr(tls, "stage", None) or OUTSIDE
+            with self._lock:
+                self._stage_imp[stage] = self._stage_imp.get(stage, 0.0) + ms
+                prev = self._modules.get(name)
+                if prev is None or prev[0] < ms:
+                    self._modules[name] = (ms, stage)
+
+    def on_boot_event(self, name, status, stage):
+        """BootPipeline.on_event handler - runs on the stage's own thread."""
+        if status == "running":
+            self._tls.stage = name
+        elif getattr(self._tls, "stage", None) == name:
+            self._tls.stage = None
+
+    def mark(self, milestone: str):
+        self.milestones[milestone] = round(self.elapsed_ms(), 2)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    # ── Report ───────────────────────────────────────────────────────────────
+    def report(self, boot=None) -> dict:
+        with self._lock:
+            stage_imp = dict(self._stage_imp)
+            modules   = sorted(self._modules.items(), key=lambda kv: -kv[1][0])[:40]
+        stages = []
+        for t in (boot.timings() if boot else []):
+            imp = stage_imp.get(t["stage"], 0.0)
+            stages.append({**t, "import_ms": round(imp, 2),
+                           "run_ms": round(max(t["elapsed_ms"] - imp, 0.0), 2)})
+        return {
+            "started":     self.started.isoformat(timespec="seconds"),
+            "python":      sys.version.split()[0],
+            "platform":    platform.platform(),
+            "qt_platform": os.environ.get("QT_QPA_PLATFORM", ""),
+            "argv":        sys.argv[1:],
+            "total_ms":    round(self.elapsed_ms(), 2),
+            "milestones":  self.milestones,
+            "time_to_interactive_ms": self.milestones.get("interactive"),
+            "import_ms": {
+                "total":   round(sum(stage_imp.values()), 2),
+                "outside_stages": round(stage_imp.get(OUTSIDE, 0.0), 2),
+            },
+            "stages":      stages,
+            "slowest_imports": [{"module": m, "ms": round(ms, 2), "stage": st}
+                                for m, (ms, st) in modules],
+            **self.extra,
+        }
+
+    def write(self, boot=None, path=None) -> Path:
+        if path is None:
+            from config.settings import LOGS_DIR
+            path = Path(LOGS_DIR) / "startup" / \
+                f"startup_profile_{self.started.strftime('%Y%m%d_%H%M%S')}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rep = self.report(boot)
+        path.write_text(json.dumps(rep, indent=2), encoding="utf-8")
+        tti = rep["time_to_interactive_ms"]
+        logger.info(f"Startup profile: {rep['total_ms']:.0f} ms total, "
+                    f"{rep['import_ms']['total']:.0f} ms imports"
+                    + (f", interactive at {tti:.0f} ms" if tti is not None else "") + f" -> {path}")
+        return path
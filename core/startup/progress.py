@@ -0,0 +1,71 @@
+"""
+core/startup/progress.py
+Real boot progress for the launcher splash.
+  - percentages weighted by each stage's measured cost (EMA of past boots,
+    stored in data/boot_timings.json), first boot falls back to DEFAULT_MS
+  - stage events arrive on any thread; poll() is called on the GUI thread
+"""
+import json, logging, threading
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Boot")
+
+# Rough first-boot costs (ms) until real measurements exist
+DEFAULT_MS = {"app": 150, "theme": 40, "enc": 60, "db": 250, "state": 30, "schema": 5,
+              "migrations": 300, "seed": 150, "flags": 30, "recovery": 600}
+UNKNOWN_MS = 50
+EMA_ALPHA  = 0.5
+
+
+class BootProgress:
+    def __init__(self, boot, phase: str, store: Path):
+        self.store   = Path(store)
+        self.weights = {**DEFAULT_MS, **self._load()}
+        self._names  = [s.name for s in boot.stages(phase)]
+        self._total  = sum(self._w(n) for n in self._names) or 1.0
+        self._done   = 0.0
+        self._label  = ""
+        self._last   = None
+        self._lock   = threading.Lock()
+        self._measured = {}
+        boot.add_listener(self.on_event)
+
+    def _w(self, name) -> float:
+        return float(self.weights.get(name, UNKNOWN_MS))
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.store.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def on_event(self, name, status, stage):
+        if name not in self._names:
+            return
+        with self._lock:
+            if status == "running":
+                self._label = stage.label
+            elif status in ("done", "failed", "skipped"):
+                self._done += self._w(name)
+                if status == "done":
+                    self._measured[name] = stage.elapsed_ms
+
+    def poll(self):
+        """(message, percent) if it changed since the last poll, else None."""
+        with self._lock:
+            cur = (self._label, min(99, int(100 * self._done / self._total)))
+        if cur == self._last:
+            return None
+        self._last = cur
+        return cur
+
+    def save(self):
+        """Fold this boot's timings into the stored weights."""
+        w = dict(self.weights)
+        for n, ms in self._measured.items():
+            w[n] = round(EMA_ALPHA * ms + (1 - EMA_ALPHA) * w.get(n, ms), 1)
+        try:
+            self.store.parent.mkdir(parents=True, exist_ok=True)
+            self.store.write_text(json.dumps(w, indent=1), encoding="utf-8")
+        except Exception as e:
+            logger.debug(f"Boot timings not saved: {e}")
@@ -0,0 +1,92 @@
+"""
+core/startup/schema_stamp.py
+Boot fast path for migrations + seeding
+  - stamp = hash of database/migrations/* and database/seeders/* (names +
+    contents); stored in the settings table ("schema_stamp")
+  - when it matches, the migrations / seed stages skip run_all() and
+    seed_all() entirely; any change to a migration or to the seeded defaults
+    changes the hash, so an update re-checks once and stamps again
+  - per-branch defaults (AutomationEngine / WATemplateManager.install_defaults)
+    get their own stamps, hashed from the packages that define those defaults
+"""
+import hashlib, logging
+from pathlib import Path
+
+logger = logging.getLogger("AGMS.Schema")
+
+STAMP_KEY      = "schema_stamp"
+SCHEMA_SOURCES = ("database/migrations", "database/seeders")
+# kind -> package that defines the defaults its install_defaults() writes
+DEFAULT_SOURCES = {
+    "automation":   ("modules/automation",),
+    "wa_templates": ("modules/whatsapp_engine",),
+}
+_SUFFIXES = (".sql", ".py", ".json")
+
+
+def fingerprint(root: Path, sources) -> str:
+    """sha1 over the files in `sources` (dirs are not recursed; a missing
+    source hashes as missing, so adding it later changes the stamp)."""
+    h = hashlib.sha1()
+    for rel in sources:
+        p = Path(root) / rel
+        files = sorted(p.glob("*")) if p.is_dir() else [p]
+        h.update(rel.encode("utf-8") + b"\0")
+        for f in files:
+            if f.is_file() and f.suffix in _SUFFIXES:
+                h.update(f.name.encode("utf-8") + b"\0")
+                h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+class SchemaStamp:
+    def __init__(self, db, root: Path):
+        self.db       = db
+        self.root     = Path(root)
+        self.expected = fingerprint(self.root, SCHEMA_SOURCES)
+        self.current  = self._get(STAMP_KEY)
+        self.fresh    = self.current == self.expected
+        self._defaults = {}
+
+    def _get(self, key: str):
+        try:
+            return self.db.get_setting(key) if hasattr(self.db, "get_setting") else None
+        except Exception as e:
+            logger.debug(f"Stamp read {key}: {e}")
+            return None
+
+    def _set(self, key: str, value: str):
+        if not hasattr(self.db, "set_setting"):
+            return
+        try:
+            self.db.set_setting(key, value)
+        except Exception as e:
+            logger.debug(f"Stamp write {key}: {e}")
+
+    def save(self):
+        """Call once migrations and seeding both completed cleanly."""
+        if not self.fresh:
+            self._set(STAMP_KEY, self.expected)
+            self.fresh, self.current = True, self.expected
+            logger.info(f"Schema stamp updated: {self.expected}")
+
+    def save_if_clean(self, migrations) -> bool:
+        """Stamp after seeding unless the migrations stage failed (None) or
+        run_all() reported errors - the next boot must retry them."""
+        if migrations is None or migrations.get("errors") or migrations.get("failed"):
+            logger.info("Schema stamp not updated: migrations did not complete cleanly")
+            return False
+        self.save()
+        return True
+
+    # ── Per-branch defaults ──────────────────────────────────────────────────
+    def _defaults_value(self, kind: str) -> str:
+        if kind not in self._defaults:
+            self._defaults[kind] = f"{self.expected}:{fingerprint(self.root, DEFAULT_SOURCES[kind])}"
+        return self._defaults[kind]
+
+    def defaults_fresh(self, kind: str, branch_id) -> bool:
+        return self._get(f"defaults_stamp:{kind}:{branch_id}") == self._defaults_value(kind)
+
+    def save_defaults(self, kind: str, branch_id):
+        self._set(f"defaults_stamp:{kind}:{branch_id}", self._defaults_value(kind))
@@ -5,8 +5,11 @@ AGMS Enterprise v3.0 — Smart Launcher
   2. Auto-install required packages
   3. Qt splash screen with progress
   4. Launch main.py
+
+  --profile-startup  also time the launcher steps (see main.py / logs/startup/)
 """
-import sys, os, subprocess, json, time
+import sys, os, subprocess, json, time, sysconfig, itertools
+import importlib.util, importlib.metadata
 from pathlib import Path
 
 ROOT   = Path(__file__).resolve().parent
@@ -54,18 +57,84 @@ def check_python():
     print(f"{GREEN}✅ Python {v.major}.{v.minor}.{v.micro}{RESET}")
 
 
-def is_installed(pkg_import: str) -> bool:
+# ── Dependency check (metadata only - never imports the packages) ───────────
+DEPS_CACHE = ROOT / "data" / ".deps_cache.json"
+
+
+def _split_spec(pkg_install: str):
+    """'qrcode[pil]>=7.4.0' -> ('qrcode', '7.4.0');  'easyocr' -> ('easyocr', None)"""
+    name, _, minimum = pkg_install.partition(">=")
+    return name.split("[")[0].strip(), (minimum.strip() or None)
+
+
+def _version_tuple(v: str) -> tuple:
+    out = []
+    for part in v.split("."):
+        digits = "".join(itertools.takewhile(str.isdigit, part))
+        if not digits:
+            break
+        out.append(int(digits))
+    return tuple(out)
+
+
+def _version_at_least(installed: str, minimum: str) -> bool:
+    """'7.4' >= '7.4.0' - shorter versions are zero-padded before comparing."""
+    a, b = _version_tuple(installed), _version_tuple(minimum)
+    n = max(len(a), len(b))
+    return a + (0,) * (n - len(a)) >= b + (0,) * (n - len(b))
+
+
+def is_installed(pkg_import: str, pkg_install: str = "") -> bool:
+    """True if the module is importable and its distribution meets the >= pin."""
     try:
-        __import__(pkg_import.split(".")[0])
-        return True
-    except ImportError:
+        if importlib.util.find_spec(pkg_import.split(".")[0]) is None:
+            return False
+    except (ImportError, ValueError):
         return False
+    dist, minimum = _split_spec(pkg_install) if pkg_install else (None, None)
+    if not minimum:
+        return True
+    try:
+        return _version_at_least(importlib.metadata.version(dist), minimum)
+    except importlib.metadata.PackageNotFoundError:
+        return True     # importable but not pip-managed (e.g. system package)
+
+
+def _deps_fingerprint() -> dict:
+    """Interpreter + site-packages mtimes + pins: any change forces a re-check."""
+    paths = {sysconfig.get_paths()[k] for k in ("purelib", "platlib")}
+    try:
+        import site
+        paths.add(site.getusersitepackages())
+    except Exception:
+        pass
+    mtimes = {p: os.stat(p).st_mtime_ns for p in sorted(paths) if os.path.isdir(p)}
+    return {"python": sys.executable, "version": sys.version,
+            "site": mtimes, "pins": [REQUIRED, OPTIONAL]}
+
+
+def _load_deps_cache():
+    try:
+        return json.loads(DEPS_CACHE.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
 
+def _save_deps_cache(fp: dict, optional_missing: list):
+    try:
+        DEPS_CACHE.parent.mkdir(exist_ok=True)
+        DEPS_CACHE.write_text(json.dumps({"fingerprint": fp,
+                                          "optional_missing": optional_missing}),
+                              encoding="utf-8")
+    except OSError:
+        pass
 
-def install_pkg(pkg_import: str, pkg_install: str) -> bool:
-    print(f"   {YELLOW}⬇  Installing {pkg_install}…{RESET}", end="", flush=True)
+
+def install_pkgs(pkgs: list) -> bool:
+    """Install packages with a single pip call (all-or-nothing, like pip)."""
+    print(f"   {YELLOW}⬇  Installing {', '.join(pkgs)}…{RESET}", end="", flush=True)
     result = subprocess.run(
-        [sys.executable, "-m", "pip", "install", pkg_install, "-q",
+        [sys.executable, "-m", "pip", "install", *pkgs, "-q",
          "--break-system-packages"],
         capture_output=True, text=True)
     if result.returncode == 0:
@@ -73,7 +142,7 @@ def install_pkg(pkg_import: str, pkg_install: str) -> bool:
         return True
     # Try without --break-system-packages
     result2 = subprocess.run(
-        [sys.executable, "-m", "pip", "install", pkg_install, "-q"],
+        [sys.executable, "-m", "pip", "install", *pkgs, "-q"],
         capture_output=True, text=True)
     if result2.returncode == 0:
         print(f" {GREEN}✓{RESET}")
@@ -84,18 +153,27 @@ def install_pkg(pkg_import: str, pkg_install: str) -> bool:
 
 def check_and_install():
     print(f"\n{BOLD}Checking dependencies…{RESET}")
-    missing = []
-    for imp, pkg in REQUIRED.items():
-        if not is_installed(imp):
-            missing.append((imp, pkg))
+    fp     = _deps_fingerprint()
+    cached = _load_deps_cache()
+    if cached and cached.get("fingerprint") == fp:
+        print(f"  {GREEN}✅ All required packages present (unchanged since last check){RESET}")
+        _report_optional(cached.get("optional_missing", []))
+        return
+
+    missing = [(imp, pkg) for imp, pkg in REQUIRED.items() if not is_installed(imp, pkg)]
 
+    failed = []
     if missing:
         print(f"  Installing {len(missing)} required packages:")
-        failed = []
-        for imp, pkg in missing:
-            ok = install_pkg(imp, pkg)
-            if not ok:
-                failed.append(pkg)
+        importlib.invalidate_caches()
+        if not install_pkgs([pkg for _, pkg in missing]):
+            # one unresolvable requirement fails the whole batch: retry one by one
+            importlib.invalidate_caches()
+            for imp, pkg in missing:
+                if not is_installed(imp, pkg):
+                    install_pkgs([pkg])
+            importlib.invalidate_caches()
+            failed = [pkg for imp, pkg in missing if not is_installed(imp, pkg)]
         if failed:
             print(f"\n{RED}❌ Failed to install: {failed}{RESET}")
             print(f"Run manually: pip install {' '.join(failed)}")
@@ -104,7 +182,13 @@ def check_and_install():
         print(f"  {GREEN}✅ All required packages present{RESET}")
 
     # Optional packages (silent check)
-    optional_missing = [pkg for imp, pkg in OPTIONAL.items() if not is_installed(imp)]
+    optional_missing = [pkg for imp, pkg in OPTIONAL.items() if not is_installed(imp, pkg)]
+    _report_optional(optional_missing)
+    if not failed:
+        _save_deps_cache(_deps_fingerprint(), optional_missing)   # pip changed mtimes
+
+
+def _report_optional(optional_missing: list):
     if optional_missing:
         print(f"  {YELLOW}ℹ  Optional packages not installed: {', '.join(optional_missing)}{RESET}")
         print(f"  {YELLOW}   OCR / WhatsApp QR / Firebase require these. Install via Settings.{RESET}")
@@ -122,18 +206,18 @@ def setup_config():
 
 
 def launch_with_splash():
-    """Launch main app with Qt splash screen."""
+    """Launch main app with Qt splash screen driven by real boot-stage events."""
     try:
-        from PySide6.QtWidgets import QApplication, QSplashScreen, QLabel
-        from PySide6.QtCore    import Qt, QTimer
+        from PySide6.QtWidgets import QApplication, QSplashScreen
+        from PySide6.QtCore    import Qt, QRect
         from PySide6.QtGui     import QPixmap, QColor, QPainter, QFont, QBrush
 
         app = QApplication.instance() or QApplication(sys.argv)
 
-        # Build splash pixmap
-        pm = QPixmap(520, 300)
-        pm.fill(QColor("#0d1117"))
-        p  = QPainter(pm)
+        # Static card layer - painted once
+        card = QPixmap(520, 300)
+        card.fill(QColor("#0d1117"))
+        p  = QPainter(card)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Dark card background
@@ -145,68 +229,70 @@ def launch_with_splash():
         title_font = QFont("Segoe UI", 22, QFont.Weight.Bold)
         p.setFont(title_font)
         p.setPen(QColor("#58a6ff"))
-        p.drawText(pm.rect().adjusted(0, 60, 0, 0), Qt.AlignmentFlag.AlignHCenter, "AGMS Enterprise")
+        p.drawText(card.rect().adjusted(0, 60, 0, 0), Qt.AlignmentFlag.AlignHCenter, "AGMS Enterprise")
 
         # Subtitle
         sub_font = QFont("Segoe UI", 10)
         p.setFont(sub_font)
         p.setPen(QColor("#8b949e"))
-        p.drawText(pm.rect().adjusted(0, 110, 0, 0), Qt.AlignmentFlag.AlignHCenter,
+        p.drawText(card.rect().adjusted(0, 110, 0, 0), Qt.AlignmentFlag.AlignHCenter,
                    "AI Business Growth OS  •  AG Multi Services")
 
         # Version badge
         p.setPen(QColor("#3fb950"))
         ver_font = QFont("Segoe UI", 9)
         p.setFont(ver_font)
-        p.drawText(pm.rect().adjusted(0, 140, 0, 0), Qt.AlignmentFlag.AlignHCenter, "v3.0.0  |  Production")
+        p.drawText(card.rect().adjusted(0, 140, 0, 0), Qt.AlignmentFlag.AlignHCenter, "v3.0.0  |  Production")
 
         p.end()
 
-        splash = QSplashScreen(pm)
+        # Dynamic layer: status text + bar are redrawn over the cached card
+        frame   = QPixmap(card)
+        dyn     = QRect(40, 196, 440, 56)
+        bar_bg  = (QBrush(QColor("#21262d")), QColor("#30363d"))
+        bar_fg  = (QBrush(QColor("#1f6feb")), QColor("#58a6ff"))
+        status_font, status_pen = QFont("Segoe UI", 9), QColor("#8b949e")
+
+        splash = QSplashScreen(frame)
         splash.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
         splash.show()
 
         def _update(msg: str, pct: int):
-            bar_w   = int(400 * pct / 100)
-            pm2     = QPixmap(pm)
-            p2      = QPainter(pm2)
+            if not splash.isVisible():
+                return
+            bar_w = int(400 * pct / 100)
+            p2 = QPainter(frame)
+            p2.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p2.drawPixmap(dyn, card, dyn)
             # Progress bar
-            p2.setBrush(QBrush(QColor("#21262d")))
-            p2.setPen(QColor("#30363d"))
+            p2.setBrush(bar_bg[0]); p2.setPen(bar_bg[1])
             p2.drawRoundedRect(60, 230, 400, 16, 8, 8)
-            p2.setBrush(QBrush(QColor("#1f6feb")))
-            p2.setPen(QColor("#58a6ff"))
+            p2.setBrush(bar_fg[0]); p2.setPen(bar_fg[1])
             p2.drawRoundedRect(60, 230, max(bar_w, 4), 16, 8, 8)
             # Status text
-            sf = QFont("Segoe UI", 9)
-            p2.setFont(sf)
-            p2.setPen(QColor("#8b949e"))
+            p2.setFont(status_font); p2.setPen(status_pen)
             p2.drawText(60, 216, msg)
             p2.end()
-            splash.setPixmap(pm2)
+            splash.setPixmap(frame)
             app.processEvents()
 
-        _update("Initialising…", 10)
-        time.sleep(0.2)
-        _update("Loading database…", 35)
-        time.sleep(0.2)
-        _update("Starting services…", 65)
-        time.sleep(0.2)
-        _update("Ready!", 100)
-        time.sleep(0.3)
+        def _boot_progress(msg: str, pct: int):
+            # launcher owns the first 10%, main.main()'s boot phase the rest
+            _update(msg, 10 + int(pct * 0.9))
+            if pct >= 100:
+                splash.close()      # login / error dialogs must not sit under the splash
 
-        # Import and run main
+        _update("Loading modules…", 5)
         if str(ROOT) not in sys.path:
             sys.path.insert(0, str(ROOT))
-
         import main as _main_mod
-        splash.finish(None)
-        return _main_mod.main()
-
     except Exception as e:
         print(f"{RED}Splash failed: {e}{RESET} — launching directly")
         return launch_direct()
 
+    # Run the real boot outside the try: a failing main() must not boot twice
+    return _main_mod.main(progress=_boot_progress)
+
 
 def launch_direct():
     """Fallback: launch without splash."""
@@ -222,11 +308,29 @@ def mark_setup():
     marker.write_text("ok")
 
 
+def _profiled(prof, name: str, fn):
+    """Run a launcher step, charging its wall-clock to the startup profile."""
+    if prof is None:
+        return fn()
+    t = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        prof.extra.setdefault("launcher_ms", {})[name] = round((time.perf_counter() - t) * 1000, 2)
+
+
 def main():
+    prof = None
+    if "--profile-startup" in sys.argv:
+        if str(ROOT) not in sys.path:
+            sys.path.insert(0, str(ROOT))
+        from core.startup.profiler import StartupProfiler
+        prof = StartupProfiler.install()
+
     banner()
-    check_python()
-    check_and_install()
-    setup_config()
+    _profiled(prof, "check_python", check_python)
+    _profiled(prof, "check_and_install", check_and_install)
+    _profiled(prof, "setup_config", setup_config)
 
     marker = ROOT / "data" / ".setup_done"
     if not marker.exists():
@@ -1,25 +1,42 @@
 """
 main.py - AGMS Enterprise v3.0 Production Entry Point
 FIXES: correct boot order, single QApp, 're' renamed to 'recovery'
+
+Flags:
+  --profile-startup   time every boot stage + import, JSON report -> logs/startup/
+  --profile-out PATH  write the startup profile to PATH instead
+  --boot-only         stop after the blocking boot phase (benchmarks, no login)
+  --db-path PATH      use another database file (benchmarks, migration tests)
+  --log-json          write agms.log as JSON lines
+
+Env: AGMS_DATA_DIR / AGMS_LOGS_DIR override config.settings.DATA_DIR / LOGS_DIR
 """
-import sys, logging, traceback
+import sys, os, logging, traceback, argparse, threading
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+# Hook imports before anything heavy is loaded
+if "--profile-startup" in sys.argv:
+    from core.startup.profiler import StartupProfiler
+    StartupProfiler.install()
+
+# AGMS_DATA_DIR / AGMS_LOGS_DIR: benchmarks + tests keep data/ and logs/ out of the install
+if os.environ.get("AGMS_DATA_DIR") or os.environ.get("AGMS_LOGS_DIR"):
+    import config.settings as _settings
+    for _env, _attr in (("AGMS_DATA_DIR", "DATA_DIR"), ("AGMS_LOGS_DIR", "LOGS_DIR")):
+        if os.environ.get(_env):
+            setattr(_settings, _attr, Path(os.environ[_env]).resolve())
+            getattr(_settings, _attr).mkdir(parents=True, exist_ok=True)
+
 from config.settings import LOGS_DIR, ensure_dirs
 ensure_dirs()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(LOGS_DIR / "agms.log", encoding="utf-8"),
-    ]
-)
+# Callers only enqueue; a listener thread writes console + rotating agms.log
+from core.logs.log_pipeline import configure_logging
+configure_logging(LOGS_DIR, level=logging.INFO, json_lines="--log-json" in sys.argv)
 logger = logging.getLogger("AGMS.Main")
 
 
@@ -42,98 +59,369 @@ def _crash_handler(exc_type, exc_value, exc_tb):
 sys.excepthook = _crash_handler
 
 
-def main() -> int:
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("--profile-startup", action="store_true")
+    ap.add_argument("--profile-out")
+    ap.add_argument("--boot-only", action="store_true")
+    ap.add_argument("--db-path")
+    ap.add_argument("--log-json", action="store_true")      # read at import time
+    args, _ = ap.parse_known_args(argv)     # the rest belongs to Qt
+    return args
+
+
+def main(progress=None) -> int:
+    """progress(message, percent) is called on the GUI thread while the
+    blocking boot phase runs (launcher splash); 100 means 'about to show UI'."""
+    args = _parse_args(sys.argv[1:])
+    prof = None
+    if args.profile_startup:
+        from core.startup.profiler import StartupProfiler
+        prof = StartupProfiler.install()
+    if args.db_path:
+        import config.settings as s
+        s.DB_PATH = Path(args.db_path).resolve()
+
     from PySide6.QtWidgets import QApplication, QMessageBox
-    from PySide6.QtCore    import Qt
+    from PySide6.QtCore    import QTimer
     from PySide6.QtGui     import QFont
-
-    # [1] Qt Application - created ONCE
-    app = QApplication(sys.argv)
-    app.setApplicationName("AGMS Enterprise")
-    app.setApplicationVersion("3.0.0")
-    app.setOrganizationName("AG Multi Services")
-    app.setStyle("Fusion")
-    theme_file = ROOT / "config" / "theme.qss"
-    if theme_file.exists():
-        app.setStyleSheet(theme_file.read_text(encoding="utf-8"))
-    font = QFont("Segoe UI", 10)
-    font.setHintingPreference(QFont.HintingPreference.PreferDefaultHinting)
-    app.setFont(font)
+    from core.startup.boot_pipeline import BootPipeline, BootError, MAIN, main_thread_invoker
+    from core.metrics.metrics import Metrics
+
+    metrics = Metrics(LOGS_DIR / "metrics")
+
+    def _on_phase(phase, wall_ms):
+        if prof:
+            prof.mark(f"{phase}_done")
+            if phase == "post_show":
+                prof.write(boot, args.profile_out)
+
+    # Stages declare what they need; independent ones run concurrently.
+    # "boot" blocks until login, "background" runs during login,
+    # "post_show" (network + schedulers) starts once the window is painted.
+    boot = BootPipeline(max_workers=4,
+                        on_event=prof.on_boot_event if prof else None,
+                        on_phase=_on_phase)
+    boot.add_listener(lambda name, status, s: status in ("done", "failed") and
+                      metrics.gauge("boot_stage_ms", stage=name).set(s.elapsed_ms))
+
+    # [1] Qt Application - created ONCE (GUI thread)
+    @boot.stage("app", thread=MAIN, required=True, label="Starting Qt…")
+    def _app(ctx):
+        app = QApplication.instance() or QApplication(sys.argv)   # launcher may own it
+        app.setApplicationName("AGMS Enterprise")
+        app.setApplicationVersion("3.0.0")
+        app.setOrganizationName("AG Multi Services")
+        app.setStyle("Fusion")
+        return app
+
+    @boot.stage("theme", deps=("app",), thread=MAIN, label="Loading theme…")
+    def _theme(ctx):
+        from core.startup.assets import AssetCache
+        from config.settings import DATA_DIR
+        app    = ctx["app"]
+        assets = AssetCache(DATA_DIR)              # minified qss + resolved font, first run only
+        qss = assets.stylesheet(ROOT / "config" / "theme.qss")
+        if qss:
+            app.setStyleSheet(qss)
+        font = QFont(assets.font_family(), 10)
+        font.setHintingPreference(QFont.HintingPreference.PreferDefaultHinting)
+        app.setFont(font)
 
     # [2] Core: Encryption -> DB -> AppState (MUST be first)
-    try:
+    #     GUI thread: these objects live for the whole session and may own Qt
+    #     timers/signals, so they keep the thread they always had
+    @boot.stage("enc", thread=MAIN, required=True, label="Loading encryption keys…")
+    def _enc(ctx):
         from core.security.encryption import EncryptionManager
-        from database.db_manager      import DatabaseManager
-        from core.dashboard.app_state import AppState
-        enc = EncryptionManager()
-        db  = DatabaseManager(enc)
+        return EncryptionManager()
+
+    @boot.stage("db", deps=("enc",), thread=MAIN, required=True, label="Opening database…")
+    def _db(ctx):
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(ctx["enc"])
         db.initialise()
-        st  = AppState(db)
+        try:
+            metrics.instrument_methods(db, "db_call_ms")     # per-method latency
+        except Exception as _e: logger.debug(f"DB instrumentation: {_e}")
+        return db
+
+    @boot.stage("state", deps=("app", "db"), after=("theme",), thread=MAIN, required=True,
+                label="Preparing workspace…")
+    def _state(ctx):
+        from core.dashboard.app_state import AppState
+        st = AppState(ctx["db"])
+        st.metrics = metrics
         logger.info("Core components initialised.")
-    except Exception as e:
-        QMessageBox.critical(None, "Startup Error",
-            f"Core init failed:\n{e}\n\nCheck logs/agms.log")
-        return 1
-
-    # [3] DB Migrations (needs db)
-    try:
+        return st
+
+    # [3] DB Migrations (needs db) - skipped while the schema stamp matches
+    @boot.stage("schema", deps=("db",), log_level=logging.DEBUG, label="Checking database schema…")
+    def _schema(ctx):
+        from core.startup.schema_stamp import SchemaStamp
+        return SchemaStamp(ctx["db"], ROOT)
+
+    @boot.stage("migrations", deps=("db", "schema"), log_level=logging.DEBUG,
+                label="Applying migrations…")
+    def _migrations(ctx):
+        if ctx["schema"].fresh:
+            return {"applied": 0, "fast_path": True}
         from database.migrations.run_migrations import run_all
         from config.settings import DB_PATH
         r = run_all(str(DB_PATH))
         if r.get("applied", 0) > 0:
             logger.info(f"Migrations: {r['applied']} applied")
-    except Exception as _e: logger.debug(f"Migrations: {_e}")
-
-    # [4] Seed default data on first run (needs db)
-    try:
+        return r
+
+    # [4] Seed default data on first run (needs db, runs after migrations)
+    @boot.stage("seed", deps=("db", "schema"), after=("migrations",), label="Checking default data…")
+    def _seed(ctx):
+        schema = ctx["schema"]
+        if schema.fresh:
+            return
         from database.seeders.default_data import seed_all
-        r = seed_all(db)
+        r = seed_all(ctx["db"])
         if r.get("seeded"):
             logger.info(f"Seeded: {r.get('services', 0)} CSC services")
-    except Exception as _e: logger.warning(f"Seeder: {_e}")
-
-    # [5] Health Monitor (needs db)
-    try:
-        from core.health_monitor.health_monitor import HealthMonitor
-        _hm = HealthMonitor(db, interval=60)
-        _hm.on_alert = lambda lvl, msg: logger.warning(f"HEALTH [{lvl}]: {msg}")
-        _hm.start()
-        logger.info("HealthMonitor started")
-    except Exception as _e: logger.warning(f"HealthMonitor: {_e}")
+        schema.save_if_clean(ctx.get("migrations"))
 
-    # [6] Feature Flags (needs db)
-    try:
+    # [5] Feature Flags (needs db)
+    @boot.stage("flags", deps=("db",), after=("migrations",), label="Loading feature flags…")
+    def _flags(ctx):
         from core.feature_flags.feature_flags import get_flags
-        _flags = get_flags(db)
-        logger.info(f"FeatureFlags: {len(_flags.get_all())} flags")
-    except Exception as _e: logger.warning(f"FeatureFlags: {_e}")
-
-    # [7] Recovery Engine (needs db) - renamed 're' -> 'recovery' to avoid stdlib collision
-    try:
+        flags = get_flags(ctx["db"])
+        logger.info(f"FeatureFlags: {len(flags.get_all())} flags")
+        return flags
+
+    # [6] Recovery Engine self-heal (needs db) - 'recovery', not 're' (stdlib)
+    #     after migrations + seed: a restore must not race run_all() on the same DB
+    @boot.stage("recovery", deps=("db",), after=("migrations", "seed"), label="Verifying installation…")
+    def _recovery(ctx):
         from core.recovery.recovery_engine import RecoveryEngine
-        recovery = RecoveryEngine(db)
+        recovery = RecoveryEngine(ctx["db"])
         rep = recovery.startup_check()
         if rep.get("status") == "healed":
             logger.info(f"Self-heal: {rep.get('restored', 0)} files restored.")
-        recovery.start_scheduler(int(db.get_setting("backup_interval_hours") or 24))
-    except Exception as _e: logger.warning(f"Recovery: {_e}")
-
-    # [8] Background Update Checker (needs db)
-    try:
+        return recovery
+
+    # [6b] Optional subsystems - imported + built on first st.services.get()
+    @boot.stage("services", deps=("state",), after=("flags",), label="Registering services…")
+    def _services(ctx):
+        from core.services.service_registry import ServiceRegistry
+        db, st   = ctx["db"], ctx["state"]
+        services = ServiceRegistry(ctx.get("flags"))
+
+        def _firebase():
+            from core.cloud.firebase_sync import FirebaseSync
+            return FirebaseSync(db)
+
+        def _cloud_sync():
+            from modules.cloud_sync.sync_manager import CloudSyncManager
+            return CloudSyncManager(db)
+
+        def _whatsapp():
+            from modules.whatsapp_engine.wa_manager import WhatsAppManager
+            return WhatsAppManager(db)
+
+        def _automation():
+            from modules.automation.automation_engine import AutomationEngine
+            return AutomationEngine(db, st.wa_manager)
+
+        def _web_dashboard():
+            from web_dashboard.backend.app import app as web_app
+            return web_app
+
+        services.register("firebase", _firebase, flag="firebase_sync")
+        services.register("cloud_sync", _cloud_sync)
+        services.register("whatsapp", _whatsapp, warm=True, gui=True,
+                          imports=("modules.whatsapp_engine.wa_manager",))
+        services.register("automation", _automation, gui=True,
+                          imports=("modules.automation.automation_engine",))
+        services.register("web_dashboard", _web_dashboard)
+        st.services   = services
+        st.wa_manager = services.proxy("whatsapp") if services.is_enabled("whatsapp") else None
+        return services
+
+    # [6c] Central job scheduler - subsystems register periodic work on st.jobs
+    @boot.stage("jobs", deps=("state",), label="Scheduling background tasks…")
+    def _jobs(ctx):
+        from core.jobs.job_scheduler import JobScheduler
+        jobs = JobScheduler(max_workers=3)
+
+        def _job_done(job, ms, err):
+            metrics.histogram("job_duration_ms", job=job.name).observe(ms)
+            if err is not None:
+                metrics.counter("job_failures_total", job=job.name).inc()
+
+        def _rollup():
+            metrics.gauge("threads").set(threading.active_count())
+            try:
+                import psutil
+                metrics.gauge("rss_mb").set(psutil.Process().memory_info().rss / 1024 ** 2)
+            except Exception:
+                pass
+            metrics.rollup()
+
+        jobs.on_job_done = _job_done
+        jobs.add("metrics_rollup", _rollup, interval_s=60)
+        ctx["state"].jobs = jobs
+        return jobs
+
+    # [7] Health Monitor (needs db) - not needed for login
+    @boot.stage("health", deps=("db",), phase="background")
+    def _health(ctx):
+        from core.health_monitor.health_monitor import HealthMonitor
+        hm = HealthMonitor(ctx["db"], interval=60)
+        def _alert(lvl, msg):
+            metrics.counter("health_alerts_total", level=lvl).inc()
+            logger.warning(f"HEALTH [{lvl}]: {msg}")
+        hm.on_alert = _alert
+        hm.start()
+        logger.info("HealthMonitor started")
+        return hm
+
+    @boot.stage("jobs_start", deps=("jobs",), phase="background")
+    def _jobs_start(ctx):
+        ctx["jobs"].start()
+
+    # [8] Backup scheduler (needs recovery) - start_* calls stay on the GUI thread:
+    #     a QTimer started on a pool thread (no event loop) would never fire
+    @boot.stage("recovery_scheduler", deps=("recovery",), phase="background", thread=MAIN)
+    def _recovery_scheduler(ctx):
+        db = ctx["db"]
+        ctx["recovery"].start_scheduler(int(db.get_setting("backup_interval_hours") or 24))
+
+    # Network subsystems (post_show): import, construction and connect() run on a
+    # worker so the painted window stays responsive; only the start_* call that
+    # arms their timers runs on the GUI thread.
+
+    # [9] Background Update Checker (network)
+    @boot.stage("updater_init", deps=("db",), phase="post_show")
+    def _updater_init(ctx):
         from core.updater.update_engine import UpdateEngine
-        UpdateEngine(db).start_background_check()
-    except Exception as _e: logger.warning(f"Updater: {_e}")
+        return UpdateEngine(ctx["db"])
+
+    @boot.stage("updater", deps=("updater_init",), phase="post_show", thread=MAIN)
+    def _updater(ctx):
+        ctx["updater_init"].start_background_check()
+
+    # [10] Firebase Sync - optional (network)
+    @boot.stage("firebase_connect", deps=("services",), phase="post_show",
+                log_level=logging.DEBUG)
+    def _firebase_connect(ctx):
+        fb = ctx["services"].get("firebase")
+        if fb and fb.is_configured() and fb.connect():
+            return fb
+
+    @boot.stage("firebase", deps=("firebase_connect",), phase="post_show", thread=MAIN,
+                log_level=logging.DEBUG)
+    def _firebase(ctx):
+        fb = ctx.get("firebase_connect")
+        if fb:
+            fb.start_auto_sync(interval_minutes=15)
+            logger.info("Firebase auto-sync started")
+            return fb
+
+    # [13] Notification Engine: today's birthdays / due reminders are read on a
+    #      worker, the engine + alerts stay on the GUI thread (Qt signals)
+    @boot.stage("reminders", deps=("state",), phase="post_show")
+    def _reminders(ctx):
+        db, branch = ctx["db"], ctx["state"].branch_id
+        return {"birthdays": db.get_birthdays_today(branch),
+                "dues":      db.get_due_reminders(branch)}
+
+    @boot.stage("notifications", deps=("state",), after=("reminders",), phase="post_show",
+                thread=MAIN)
+    def _notifications(ctx):
+        from core.notifications.notification_engine import NotificationEngine, NotificationSignals
+        db, st   = ctx["db"], ctx["state"]
+        sig      = NotificationSignals()
+        sig.show_popup.connect(st.notification.emit)
+        notifier = NotificationEngine(db, sig)
+        rem   = ctx.get("reminders") or {}
+        bdays = rem.get("birthdays")
+        if bdays: notifier.birthday_alert(bdays, st.branch_id)
+        dues  = rem.get("dues")
+        if dues: notifier.due_reminder_alert(len(dues), st.branch_id)
+        return notifier
+
+    # [14] Cloud Sync (network)
+    @boot.stage("cloud_sync_init", deps=("services",), phase="post_show")
+    def _cloud_sync_init(ctx):
+        return ctx["services"].get("cloud_sync")
+
+    @boot.stage("cloud_sync", deps=("cloud_sync_init",), phase="post_show", thread=MAIN)
+    def _cloud_sync(ctx):
+        cs = ctx.get("cloud_sync_init")
+        if cs: cs.start_sync_scheduler()
+
+    # [15] AutoScheduler + AutomationEngine (6 background tasks, GUI thread)
+    #      WhatsApp is st.wa_manager: a lazy proxy, Selenium loads on first use
+    @boot.stage("scheduler", deps=("state",), after=("services", "notifications"),
+                phase="post_show", thread=MAIN)
+    def _scheduler(ctx):
+        from core.dashboard.auto_scheduler        import AutoScheduler
+        from modules.whatsapp_engine.wa_templates import WATemplateManager
+        db, st, services = ctx["db"], ctx["state"], ctx.get("services")
+        wa_mgr = getattr(st, "wa_manager", None)
+
+        scheduler = AutoScheduler(db, st, wa_manager=wa_mgr, notifier=ctx.get("notifications"))
+        scheduler.start_all()
+        st._scheduler = scheduler
+
+        schema = ctx.get("schema")
+        branch, user_id = st.branch_id, getattr(st, "user_id", "")
+
+        def _stale(kind):
+            return not (schema and schema.defaults_fresh(kind, branch))
+
+        eng = services.get("automation") if services else None
+        if eng:
+            if _stale("automation"):
+                eng.install_defaults(branch, user_id)
+                if schema: schema.save_defaults("automation", branch)
+            eng.load_rules(branch)
+            eng.start_scheduler()
+
+        if _stale("wa_templates"):
+            WATemplateManager(db).install_defaults(branch, user_id)
+            if schema: schema.save_defaults("wa_templates", branch)
+        logger.info("AutoScheduler + AutomationEngine: 6 tasks running.")
+
+    from core.startup.progress import BootProgress
+    from config.settings import DATA_DIR
+    bp = BootProgress(boot, "boot", Path(DATA_DIR) / "boot_timings.json")
+
+    def _pump():
+        upd = progress and bp.poll()
+        if upd:
+            progress(*upd)
 
-    # [9] Firebase Sync - optional (needs db)
     try:
-        from core.cloud.firebase_sync import FirebaseSync
-        _fb = FirebaseSync(db)
-        if _fb.is_configured() and _fb.connect():
-            _fb.start_auto_sync(interval_minutes=15)
-            logger.info("Firebase auto-sync started")
-    except Exception as _e: logger.debug(f"Firebase: {_e}")
+        boot.run("boot", on_idle=_pump)
+    except BootError as e:
+        if progress: progress("Startup failed", 100)
+        QMessageBox.critical(None, "Startup Error",
+            f"Core init failed:\n{e.error}\n\nCheck logs/agms.log")
+        boot.shutdown()
+        return 1
+    bp.save()
+    if progress: progress("Ready!", 100)
 
-    # [10] Auth + Login
+    if args.boot_only:
+        if prof:
+            prof.write(boot, args.profile_out)
+        boot.shutdown()
+        return 0
+
+    ctx = boot.ctx
+    app, enc, db, st = ctx["app"], ctx["enc"], ctx["db"], ctx["state"]
+    post_to_main = main_thread_invoker()
+    if ctx.get("services"):
+        ctx["services"].post_to_main = post_to_main     # gui=True services build here
+    boot.start("background", post_to_main)
+
+    # [11] Auth + Login
     from core.auth.auth_manager import AuthManager
     from core.auth.login_ui    import LoginDialog
     auth = AuthManager(db, enc)
@@ -145,92 +433,70 @@ def main() -> int:
             OnboardingWizard(db, enc).exec()
     except Exception as _e: logger.warning(f"Onboarding: {_e}")
 
-    # Login dialog
-    user = None
-
-    def _show_login() -> bool:
-        nonlocal user
-        dlg = LoginDialog(auth)
-        dlg.login_success.connect(lambda u: (user.__setitem__(0, u) if isinstance(user, list) else None))
-        # Use a mutable container for closure
-        _u = []
-        dlg.login_success.connect(lambda u: _u.append(u))
-        result = dlg.exec() == dlg.DialogCode.Accepted
-        if _u:
-            nonlocal user
-            user = _u[0]
-        return result
-
-    # Simpler closure approach
+    # Login dialog - mutable container for the closure
     _login_result = [None]
 
     def _do_login() -> bool:
         dlg = LoginDialog(auth)
         dlg.login_success.connect(lambda u: _login_result.__setitem__(0, u))
+        if prof: prof.mark("login_shown")
         return dlg.exec() == dlg.DialogCode.Accepted
 
     if not _do_login():
         logger.info("Login cancelled.")
+        if prof: prof.write(boot, args.profile_out)
+        boot.shutdown()
         return 0
 
     user = _login_result[0] or auth.quick_dev_login()
     st.login(user)
     logger.info(f"Logged in: {user.get('name')} [{user.get('role')}]")
 
-    # [11] Main Window
+    # [12] Main Window
     from core.dashboard.main_window import MainWindow
     window = MainWindow(st, db, enc)
 
-    # [12] Notification Engine
-    notifier = None
-    try:
-        from core.notifications.notification_engine import NotificationEngine, NotificationSignals
-        sig      = NotificationSignals()
-        sig.show_popup.connect(st.notification.emit)
-        notifier = NotificationEngine(db, sig)
-        bdays = db.get_birthdays_today(st.branch_id)
-        if bdays: notifier.birthday_alert(bdays, st.branch_id)
-        dues = db.get_due_reminders(st.branch_id)
-        if dues: notifier.due_reminder_alert(len(dues), st.branch_id)
-    except Exception as _e: logger.warning(f"Notifications: {_e}")
-
-    # [13] Cloud Sync
-    try:
-        from modules.cloud_sync.sync_manager import CloudSyncManager
-        CloudSyncManager(db).start_sync_scheduler()
-    except Exception as _e: logger.warning(f"Cloud sync: {_e}")
-
-    # [14] WhatsApp Manager
-    wa_mgr = None
-    try:
-        from modules.whatsapp_engine.wa_manager import WhatsAppManager
-        wa_mgr = WhatsAppManager(db)
-        st.wa_manager = wa_mgr
-    except Exception as _e: logger.warning(f"WhatsApp: {_e}")
-
-    # [15] AutoScheduler + AutomationEngine (6 background tasks)
-    try:
-        from core.dashboard.auto_scheduler        import AutoScheduler
-        from modules.automation.automation_engine import AutomationEngine
-        from modules.whatsapp_engine.wa_templates import WATemplateManager
-
-        scheduler = AutoScheduler(db, st, wa_manager=wa_mgr, notifier=notifier)
-        scheduler.start_all()
-        st._scheduler = scheduler
-
-        eng = AutomationEngine(db, wa_mgr)
-        eng.install_defaults(st.branch_id, getattr(st, "user_id", ""))
-        eng.load_rules(st.branch_id)
-        eng.start_scheduler()
-
-        WATemplateManager(db).install_defaults(st.branch_id, getattr(st, "user_id", ""))
-        logger.info("AutoScheduler + AutomationEngine: 6 tasks running.")
-    except Exception as _e: logger.warning(f"Scheduler: {_e}")
-
-    # [16] Show window + event loop
+    # [16] Show window + event loop; network/scheduler stages start after first paint
     window.show()
+    if prof:
+        prof.mark("window_shown")
+        # first event-loop tick after show(): window painted, input accepted
+        QTimer.singleShot(0, lambda: prof.mark("interactive"))
+
+    # UI event-loop lag -> metrics; heavy jobs wait while the loop is busy
+    from core.metrics.ui_lag import UiLagProbe
+    lag_probe = UiLagProbe(metrics)
+    lag_probe.start()
+    if ctx.get("jobs"):
+        ctx["jobs"].busy_probe = lag_probe.busy
+
+    # Stall watchdog: GUI thread stack -> logs/stalls/ when the loop blocks
+    from core.metrics.watchdog import MainThreadWatchdog
+    try:
+        stall_ms = float(db.get_setting("stall_threshold_ms") or 2000)
+    except Exception as _e:
+        logger.warning(f"stall_threshold_ms: {_e}"); stall_ms = 2000.0
+    watchdog = MainThreadWatchdog(lag_probe, LOGS_DIR / "stalls", metrics=metrics,
+                                  threshold_ms=stall_ms)
+    watchdog.start()
+    port = db.get_setting("metrics_port")
+    if port:
+        try:
+            metrics.serve(int(port))
+        except Exception as _e: logger.warning(f"Metrics export: {_e}")
+    QTimer.singleShot(0, lambda: boot.start("post_show", post_to_main))
+    if ctx.get("services"):
+        ctx["services"].warm_up(jobs=ctx.get("jobs"))
     logger.info("AGMS Enterprise ready.")
-    return app.exec()
+    rc = app.exec()
+    watchdog.stop()
+    lag_probe.stop()
+    if ctx.get("jobs"):
+        ctx["jobs"].stop()
+    metrics.rollup()
+    metrics.close()
+    boot.shutdown()
+    return rc
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+"""core.startup.assets - stylesheet minifier and the startup asset cache (no Qt)"""
+import os
+
+from core.startup import assets
+from core.startup.assets import AssetCache, font_fingerprint, minify_qss, narrow_families
+
+
+def test_quoted_strings_are_kept_verbatim(tmp_path):
+    qss = 'QLabel[text="a  b , c"] , QPushButton { qproperty-text: \'x  ;  y\' ; }'
+    assert minify_qss(qss, tmp_path) == \
+        'QLabel[text="a  b , c"],QPushButton{qproperty-text:\'x  ;  y\'}'
+
+
+def test_comments_are_stripped_even_with_quotes_inside(tmp_path):
+    qss = '/* "header" it\'s */\nQWidget {\n  color: #fff; /* note */\n}\n'
+    assert minify_qss(qss, tmp_path) == "QWidget{color:#fff}"
+
+
+def test_comment_markers_inside_strings_survive(tmp_path):
+    assert minify_qss('QLabel[text="/* not a comment */"] { }', tmp_path) == \
+        'QLabel[text="/* not a comment */"]{}'
+
+
+def test_relative_urls_become_absolute_and_quoted(tmp_path):
+    base = tmp_path / "theme dir"
+    out = minify_qss("QA { image: url(img/a.png); }\n"
+                     "QB { image: url('icons/b c.svg'); }\n"
+                     "QC { image: url(:/res/c.png); }", base)
+    a = (base / "img" / "a.png").resolve().as_posix()
+    b = (base / "icons" / "b c.svg").resolve().as_posix()
+    assert out == f'QA{{image:url("{a}")}}QB{{image:url("{b}")}}QC{{image:url(":/res/c.png")}}'
+
+
+def test_descendant_selectors_keep_one_space(tmp_path):
+    assert minify_qss("QDialog   QLabel:hover  >  QPushButton { }", tmp_path) == \
+        "QDialog QLabel:hover>QPushButton{}"
+
+
+def test_font_family_lists_are_narrowed_to_an_installed_family():
+    qss = 'QWidget{font-family:"Segoe UI","Inter","Ubuntu",sans-serif}'
+    assert narrow_families(qss, {"Ubuntu", "Inter"}) == 'QWidget{font-family:"Inter"}'
+    assert narrow_families(qss, set()) == qss
+
+
+def test_font_fingerprint_follows_font_dirs(tmp_path):
+    fonts = tmp_path / "fonts"
+    (fonts / "truetype").mkdir(parents=True)
+    before = font_fingerprint([fonts, tmp_path / "missing"])
+    assert before == font_fingerprint([fonts, tmp_path / "missing"])
+    (fonts / "truetype" / "inter").mkdir()
+    st = (fonts / "truetype").stat()
+    os.utime(fonts / "truetype", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert font_fingerprint([fonts]) != before
+
+
+def test_cache_is_rebuilt_when_the_font_set_changes(tmp_path, monkeypatch):
+    src = tmp_path / "theme.qss"
+    src.write_text('QWidget { font-family: "Segoe UI", "Inter", sans-serif; }', encoding="utf-8")
+    data = tmp_path / "data"
+
+    def _cache(fp, families):
+        monkeypatch.setattr(assets, "font_fingerprint", lambda dirs=None: fp)
+        c = AssetCache(data)
+        c._families = set(families)              # stands in for QFontDatabase
+        return c
+
+    c1 = _cache("fonts-v1", {"DejaVu Sans"})
+    assert c1.stylesheet(src) == 'QWidget{font-family:"Segoe UI","Inter",sans-serif}'
+    assert c1.font_family() == "DejaVu Sans"
+
+    c2 = _cache("fonts-v1", {"Inter"})           # same font set: served from cache
+    assert c2.stylesheet(src) == 'QWidget{font-family:"Segoe UI","Inter",sans-serif}'
+    assert c2.font_family() == "DejaVu Sans"
+
+    c3 = _cache("fonts-v2", {"Inter", "DejaVu Sans"})   # Inter installed later
+    assert c3.stylesheet(src) == 'QWidget{font-family:"Inter"}'
+    assert c3.font_family() == "Inter"
@@ -0,0 +1,175 @@
+"""core.startup.boot_pipeline - ordering, skipping, required stages, phases (no Qt)"""
+import threading, time
+
+import pytest
+
+from core.startup.boot_pipeline import (BootPipeline, BootError, MAIN, DONE, FAILED,
+                                        SKIPPED)
+
+
+def _status(boot):
+    return {t["stage"]: t["status"] for t in boot.timings()}
+
+
+def _fail(ctx):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def boot():
+    b = BootPipeline(max_workers=4)
+    yield b
+    b.shutdown()
+
+
+def test_deps_order_and_results(boot):
+    seen = []
+    boot.add("enc", lambda ctx: seen.append("enc") or "key")
+    boot.add("db", lambda ctx: seen.append("db") or f"db({ctx['enc']})", deps=("enc",))
+    boot.add("state", lambda ctx: seen.append("state") or ctx["db"] + "+state", deps=("db",))
+    boot.run("boot")
+    assert seen == ["enc", "db", "state"]
+    assert boot.ctx["state"] == "db(key)+state"
+    assert set(_status(boot).values()) == {DONE}
+
+
+def test_none_result_is_not_stored(boot):
+    boot.add("a", lambda ctx: None)
+    boot.run("boot")
+    assert "a" not in boot.ctx
+
+
+def test_failed_dep_skips_chain_but_after_only_orders(boot):
+    order = []
+    boot.add("migrations", _fail)
+    boot.add("seed", lambda ctx: order.append("seed"), deps=("migrations",))
+    boot.add("report", lambda ctx: order.append("report"), deps=("seed",))
+    boot.add("flags", lambda ctx: order.append("flags"), after=("migrations",))
+    boot.run("boot")
+    st = _status(boot)
+    assert st["migrations"] == FAILED
+    assert st["seed"] == SKIPPED and st["report"] == SKIPPED
+    assert st["flags"] == DONE and order == ["flags"]
+
+
+def test_after_waits_for_the_other_stage(boot):
+    done = []
+    boot.add("slow", lambda ctx: (time.sleep(0.05), done.append("slow")))
+    boot.add("late", lambda ctx: done.append("late"), after=("slow",))
+    boot.run("boot")
+    assert done == ["slow", "late"]
+
+
+def test_required_failure_raises(boot):
+    boot.add("db", _fail, required=True)
+    with pytest.raises(BootError) as ei:
+        boot.run("boot")
+    assert ei.value.stage == "db"
+    assert isinstance(ei.value.error, RuntimeError)
+
+
+def test_required_stage_skipped_by_dependency_raises(boot):
+    boot.add("enc", _fail)
+    boot.add("db", lambda ctx: 1, deps=("enc",), required=True)
+    with pytest.raises(BootError) as ei:
+        boot.run("boot")
+    assert ei.value.stage == "db"
+
+
+def test_cycle_is_rejected_before_anything_runs(boot):
+    ran = []
+    boot.add("free", lambda ctx: ran.append("free"))
+    boot.add("a", lambda ctx: ran.append("a"), deps=("b",))
+    boot.add("b", lambda ctx: ran.append("b"), after=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        boot.run("boot")
+    assert ran == []
+
+
+def test_unknown_dependency_and_duplicates(boot):
+    boot.add("a", lambda ctx: 1, deps=("missing",))
+    with pytest.raises(ValueError, match="unknown stage"):
+        boot.run("boot")
+    with pytest.raises(ValueError, match="twice"):
+        boot.add("a", lambda ctx: 1)
+    with pytest.raises(ValueError, match="unknown thread"):
+        boot.add("b", lambda ctx: 1, thread="gpu")
+
+
+def test_main_stages_run_on_the_calling_thread(boot):
+    threads = {}
+    boot.add("gui", lambda ctx: threads.__setitem__("gui", threading.current_thread()),
+             thread=MAIN)
+    boot.add("work", lambda ctx: threads.__setitem__("work", threading.current_thread()),
+             deps=("gui",))
+    boot.add("gui2", lambda ctx: threads.__setitem__("gui2", threading.current_thread()),
+             deps=("work",), thread=MAIN)
+    boot.run("boot")
+    me = threading.current_thread()
+    assert threads["gui"] is me and threads["gui2"] is me
+    assert threads["work"] is not me
+
+
+def test_independent_worker_stages_overlap(boot):
+    gate = threading.Barrier(3, timeout=2)          # fails unless all three run at once
+    for n in ("a", "b", "c"):
+        boot.add(n, lambda ctx: gate.wait())
+    boot.run("boot")
+    assert set(_status(boot).values()) == {DONE}
+
+
+def test_on_idle_is_pumped_while_waiting(boot):
+    ticks = []
+    boot.add("slow", lambda ctx: time.sleep(0.2))
+    boot.run("boot", on_idle=lambda: ticks.append(1))
+    assert len(ticks) >= 2
+
+
+def test_events_reach_listeners(boot):
+    events = []
+    boot.add_listener(lambda name, status, s: events.append((name, status)))
+    boot.add("a", lambda ctx: 1)
+    boot.add("b", _fail, deps=())
+    boot.add("c", lambda ctx: 1, deps=("b",))
+    boot.run("boot")
+    assert ("a", "running") in events and ("a", DONE) in events
+    assert ("b", FAILED) in events and ("c", SKIPPED) in events
+
+
+def test_start_completes_phase_across_threads():
+    phases = []
+    finished = threading.Event()
+
+    def _on_phase(phase, wall_ms):
+        phases.append(phase)
+        finished.set()
+
+    boot = BootPipeline(max_workers=2, on_phase=_on_phase)
+    try:
+        boot.add("core", lambda ctx: "db")
+        boot.add("health", lambda ctx: time.sleep(0.05) or ctx["core"] + "+hm",
+                 deps=("core",), phase="background")
+        boot.add("popup", lambda ctx: "shown", deps=("health",), phase="background",
+                 thread=MAIN)
+        boot.run("boot")
+
+        posted = []                                  # stand-in for the Qt invoker
+        boot.start("background", posted.append)
+        deadline = time.monotonic() + 2
+        while not boot.phase_done("background") and time.monotonic() < deadline:
+            while posted:
+                posted.pop(0)()
+            time.sleep(0.01)
+
+        assert finished.wait(1)
+        assert phases == ["boot", "background"]
+        assert boot.ctx["health"] == "db+hm" and boot.ctx["popup"] == "shown"
+    finally:
+        boot.shutdown()
+
+
+def test_later_phase_cannot_start_before_its_dependency(boot):
+    boot.add("db", lambda ctx: 1)
+    boot.add("updater", lambda ctx: 1, deps=("db",), phase="post_show")
+    with pytest.raises(ValueError, match="unfinished"):
+        boot.start("post_show", lambda fn: fn())
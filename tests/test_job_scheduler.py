@@ -0,0 +1,180 @@
+"""core.jobs.job_scheduler - back-off, coalescing, generations, busy deferral"""
+import threading, time
+
+import pytest
+
+from core.jobs import job_scheduler
+from core.jobs.job_scheduler import JobScheduler
+
+
+def _wait(pred, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return pred()
+
+
+def _stat(jobs, name):
+    return next((s for s in jobs.stats() if s["job"] == name), None)
+
+
+@pytest.fixture
+def jobs():
+    js = JobScheduler(max_workers=2)
+    yield js
+    js.stop()
+
+
+def test_periodic_job_repeats(jobs):
+    hits = []
+    jobs.add("tick", lambda: hits.append(1), interval_s=0.02, first_delay_s=0, jitter=0)
+    jobs.start()
+    assert _wait(lambda: len(hits) >= 3)
+
+
+def test_run_once_runs_and_is_removed(jobs):
+    hits = []
+    jobs.run_once("warm", lambda: hits.append(1), delay_s=0.01)
+    jobs.start()
+    assert _wait(lambda: hits and _stat(jobs, "warm") is None)
+    time.sleep(0.05)
+    assert hits == [1]
+
+
+def test_failure_backs_off_exponentially(jobs):
+    done = threading.Event()
+    jobs.on_job_done = lambda job, ms, err: done.set()
+
+    def _bad():
+        raise RuntimeError("offline")
+
+    job = jobs.add("sync", _bad, interval_s=1, first_delay_s=0, jitter=0, max_backoff_s=3600)
+    jobs.start()
+    assert done.wait(2)
+    assert _wait(lambda: job.failures == 1)
+    # 1 s interval, first failure -> 2 s back-off (regular run would be due in ~1 s)
+    assert job.due - time.monotonic() > 1.5
+    assert _stat(jobs, "sync")["last_error"] == "offline"
+
+
+def test_backoff_is_capped(jobs):
+    job = jobs.add("sync", lambda: None, interval_s=10, jitter=0, max_backoff_s=30)
+    job.failures = 7
+
+    def _bad():
+        raise RuntimeError("x")
+
+    job.fn = _bad
+    jobs._execute(job)
+    assert job.failures == 8
+    assert job.due - time.monotonic() <= 30.5
+
+
+def test_success_resets_failures(jobs):
+    job = jobs.add("sync", lambda: None, interval_s=10, jitter=0)
+    job.failures = 3
+    jobs._execute(job)
+    assert job.failures == 0
+
+
+def test_missed_runs_coalesce_into_one_catch_up(jobs):
+    hits = []
+    job = jobs.add("rollup", lambda: hits.append(1), interval_s=1, jitter=0)
+    now = time.monotonic()
+    with jobs._cond:
+        job.due = now - 5.5                    # slept through five runs
+        jobs._fire(job, now)
+    assert _wait(lambda: hits == [1])
+    assert job.missed == 5
+    assert job.due == pytest.approx(now + 1, abs=0.01)
+
+
+def test_overlapping_run_is_not_started_twice(jobs):
+    release, started = threading.Event(), []
+
+    def _slow():
+        started.append(1)
+        release.wait(2)
+
+    job = jobs.add("backup", _slow, interval_s=0.02, first_delay_s=0, jitter=0)
+    jobs.start()
+    assert _wait(lambda: job.missed >= 2)
+    assert started == [1] and job.running == 1
+    release.set()
+    assert _wait(lambda: job.runs >= 1)
+
+
+def test_trigger_supersedes_the_pending_entry(jobs):
+    hits = []
+    jobs.add("report", lambda: hits.append(1), interval_s=60, first_delay_s=60, jitter=0)
+    jobs.start()
+    jobs.trigger("report")
+    assert _wait(lambda: hits == [1])
+    assert _stat(jobs, "report")["next_in_s"] > 50       # regular schedule continues
+
+
+def test_removed_job_never_fires(jobs):
+    hits = []
+    jobs.add("gone", lambda: hits.append(1), interval_s=0.02, first_delay_s=0.05, jitter=0)
+    jobs.remove("gone")
+    jobs.trigger("gone")                                 # no-op for unknown names
+    jobs.start()
+    time.sleep(0.15)
+    assert hits == [] and _stat(jobs, "gone") is None
+
+
+def test_re_adding_invalidates_the_old_schedule(jobs):
+    old, new = [], []
+    jobs.add("sync", lambda: old.append(1), interval_s=0.05, first_delay_s=0.05, jitter=0)
+    jobs.add("sync", lambda: new.append(1), interval_s=60, first_delay_s=0, jitter=0)
+    jobs.start()
+    assert _wait(lambda: new == [1])
+    time.sleep(0.1)
+    assert old == []
+
+
+def test_pause_and_resume(jobs):
+    hits = []
+    jobs.add("wa", lambda: hits.append(1), interval_s=60, first_delay_s=0.05, jitter=0)
+    jobs.pause("wa")
+    jobs.start()
+    time.sleep(0.15)
+    assert hits == []
+    jobs.resume("wa")                                    # overdue -> runs right away
+    assert _wait(lambda: hits == [1])
+
+
+def test_heavy_job_waits_while_ui_busy(jobs, monkeypatch):
+    monkeypatch.setattr(job_scheduler, "BUSY_RETRY_S", 0.02)
+    busy, hits = [True], []
+    jobs.busy_probe = lambda: busy[0]
+    jobs.add("backup", lambda: hits.append(1), interval_s=60, first_delay_s=0,
+             jitter=0, heavy=True)
+    jobs.add("light", lambda: hits.append(0), interval_s=60, first_delay_s=0, jitter=0)
+    jobs.start()
+    assert _wait(lambda: hits == [0])                     # light jobs are not held back
+    time.sleep(0.1)
+    assert hits == [0]
+    busy[0] = False
+    assert _wait(lambda: sorted(hits) == [0, 1])
+
+
+def test_set_ui_busy_overrides_probe(jobs, monkeypatch):
+    monkeypatch.setattr(job_scheduler, "BUSY_RETRY_S", 0.02)
+    hits = []
+    jobs.set_ui_busy(True)
+    jobs.add("ocr", lambda: hits.append(1), interval_s=60, first_delay_s=0, jitter=0, heavy=True)
+    jobs.start()
+    time.sleep(0.1)
+    assert hits == []
+    jobs.set_ui_busy(False)
+    assert _wait(lambda: hits == [1])
+
+
+def test_jitter_stays_within_bounds(jobs):
+    for _ in range(200):
+        d = jobs._jittered(100.0, 0.1)
+        assert 90.0 <= d <= 110.0
+    assert jobs._jittered(100.0, 0) == 100.0
@@ -0,0 +1,30 @@
+"""launcher - metadata-only dependency check"""
+import pytest
+
+import launcher
+
+
+@pytest.mark.parametrize("installed, minimum, ok", [
+    ("7.4",      "7.4.0",  True),         # shorter installed version, same release
+    ("2.0.0",    "2.0",    True),
+    ("2.0",      "2.0.1",  False),
+    ("6.6.1",    "6.6.0",  True),
+    ("10.0",     "9.12.3", True),
+    ("42.0.5",   "42.0.0", True),
+    ("41.9",     "42.0.0", False),
+    ("2.31.0rc1", "2.31.0", True),        # pre-release suffix is ignored
+])
+def test_version_at_least(installed, minimum, ok):
+    assert launcher._version_at_least(installed, minimum) is ok
+
+
+def test_split_spec():
+    assert launcher._split_spec("qrcode[pil]>=7.4.0") == ("qrcode", "7.4.0")
+    assert launcher._split_spec("easyocr") == ("easyocr", None)
+
+
+def test_is_installed_pads_versions(monkeypatch):
+    monkeypatch.setattr(launcher.importlib.metadata, "version", lambda dist: "7.4")
+    assert launcher.is_installed("json", "qrcode[pil]>=7.4.0")
+    assert not launcher.is_installed("json", "qrcode[pil]>=7.5")
+    assert not launcher.is_installed("agms_no_such_module", "x>=1.0")
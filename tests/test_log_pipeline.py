@@ -0,0 +1,73 @@
+"""core.logs.log_pipeline - warning dedup and its repeat summaries"""
+import logging, time
+
+from core.logs import log_pipeline
+from core.logs.log_pipeline import DedupFilter
+
+
+def _rec(msg, level=logging.WARNING, created=None, name="AGMS.Health"):
+    rec = logging.makeLogRecord({"name": name, "levelno": level,
+                                 "levelname": logging.getLevelName(level), "msg": msg})
+    if created is not None:
+        rec.created = created
+    return rec
+
+
+def test_repeated_warnings_are_suppressed_within_the_window():
+    f = DedupFilter(window_s=60)
+    now = time.time()
+    assert f.filter(_rec("DB latency high", created=now))
+    assert not f.filter(_rec("DB latency high", created=now + 1))
+    assert not f.filter(_rec("DB latency high", created=now + 2))
+    assert f.filter(_rec("other warning", created=now + 3))
+
+
+def test_errors_and_criticals_are_never_deduplicated():
+    f = DedupFilter(window_s=60)
+    now = time.time()
+    for level in (logging.ERROR, logging.CRITICAL, logging.INFO):
+        assert f.filter(_rec("UNHANDLED EXCEPTION", level, created=now))
+        assert f.filter(_rec("UNHANDLED EXCEPTION", level, created=now + 1))
+
+
+def test_burst_that_stops_is_reported_when_the_window_expires():
+    out = []
+    f = DedupFilter(window_s=60, sink=out.append)
+    old = time.time() - 120                           # window long over
+    f.filter(_rec("DB latency high", created=old))
+    for i in range(4):
+        f.filter(_rec("DB latency high", created=old + i + 1))
+    f.flush()
+    assert [r.getMessage() for r in out] == ["DB latency high (repeated 4x in last 60s)"]
+    assert out[0].levelno == logging.WARNING and out[0].name == "AGMS.Health"
+    f.flush()
+    assert len(out) == 1                              # reported once
+
+
+def test_open_window_is_only_reported_when_forced():
+    out = []
+    f = DedupFilter(window_s=60, sink=out.append)
+    now = time.time()
+    f.filter(_rec("disk almost full", created=now))
+    f.filter(_rec("disk almost full", created=now))
+    f.filter(_rec("quiet", created=now))              # nothing suppressed: no summary
+    assert f.flush() == [] and out == []
+    f.flush(force=True)
+    assert len(out) == 1 and "repeated 1x" in out[0].getMessage()
+
+
+def test_stop_logging_writes_pending_repeat_counts(tmp_path):
+    log_pipeline.configure_logging(tmp_path, console=False, dedup_window_s=60)
+    try:
+        log = logging.getLogger("AGMS.Test")
+        for _ in range(5):
+            log.warning("sync failed")
+        log.error("boom")
+        log.error("boom")
+    finally:
+        log_pipeline.stop_logging()
+        logging.getLogger().handlers[:] = []
+    text = (tmp_path / "agms.log").read_text(encoding="utf-8")
+    assert text.count("sync failed") == 2             # first one + the summary
+    assert "sync failed (repeated 4x" in text
+    assert text.count("boom") == 2
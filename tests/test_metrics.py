@@ -0,0 +1,88 @@
+"""core.metrics.metrics - export format, rollups, retention"""
+import json
+from datetime import datetime, timedelta
+
+from core.metrics.metrics import Metrics
+
+
+def _sample(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return line.split(" ", 1)[1]
+    raise AssertionError(f"{series} not exported")
+
+
+def test_prometheus_values_keep_full_precision():
+    m = Metrics()
+    m.counter("jobs_total").inc(1234567)
+    m.gauge("rss_mb").set(1048576.125)
+    h = m.histogram("db_call_ms", method="query")
+    for _ in range(3):
+        h.observe(400000.5)
+    text = m.to_prometheus()
+    assert float(_sample(text, "agms_jobs_total")) == 1234567
+    assert float(_sample(text, "agms_rss_mb")) == 1048576.125
+    assert float(_sample(text, 'agms_db_call_ms_sum{method="query"}')) == 1200001.5
+    assert "e+06" not in text
+
+
+def test_prometheus_non_finite_values():
+    m = Metrics()
+    m.gauge("a").set(float("inf"))
+    m.gauge("b").set(float("nan"))
+    text = m.to_prometheus()
+    assert _sample(text, "agms_a") == "+Inf"
+    assert _sample(text, "agms_b") == "NaN"
+
+
+def _day_file(d, days_ago):
+    f = d / f"metrics_{(datetime.now() - timedelta(days=days_ago)):%Y%m%d}.jsonl"
+    f.write_text("{}\n", encoding="utf-8")
+    return f
+
+
+def test_rollup_prunes_day_files_older_than_keep_days(tmp_path):
+    old, edge, recent = _day_file(tmp_path, 20), _day_file(tmp_path, 14), _day_file(tmp_path, 3)
+    other = tmp_path / "metrics_notes.jsonl"
+    other.write_text("x", encoding="utf-8")
+    Metrics(out_dir=tmp_path, keep_days=14).rollup()
+    assert not old.exists()
+    assert edge.exists() and recent.exists() and other.exists()
+    assert (tmp_path / f"metrics_{datetime.now():%Y%m%d}.jsonl").exists()
+
+
+def test_retention_runs_once_per_day(tmp_path):
+    m = Metrics(out_dir=tmp_path, keep_days=14)
+    m.rollup()
+    old = _day_file(tmp_path, 30)               # appears after today's pass
+    m.rollup()
+    assert old.exists()
+
+
+class _Repo:
+    def query(self):
+        return 1
+
+    def rarely_used(self):
+        return 2
+
+
+def test_skip_empty_drops_zero_counters_and_unobserved_histograms(tmp_path):
+    m = Metrics(out_dir=tmp_path)
+    repo = _Repo()
+    assert m.instrument_methods(repo, "db_call_ms") == 2
+    repo.query()
+    m.counter("errors_total")
+    m.gauge("rss_mb").set(0)
+
+    full = m.snapshot()
+    assert set(full["histograms"]) == {'db_call_ms{method="query"}', 'db_call_ms{method="rarely_used"}'}
+    assert full["counters"] == {"errors_total": 0}
+
+    snap = m.rollup()
+    assert set(snap["histograms"]) == {'db_call_ms{method="query"}'}
+    assert snap["histograms"]['db_call_ms{method="query"}']["count"] == 1
+    assert snap["counters"] == {}
+    assert snap["gauges"] == {"rss_mb": 0}          # gauges are kept even at zero
+    persisted = json.loads((tmp_path / f"metrics_{datetime.now():%Y%m%d}.jsonl").read_text().splitlines()[-1])
+    assert persisted["histograms"].keys() == snap["histograms"].keys()
@@ -0,0 +1,105 @@
+"""core.startup.schema_stamp - when migrations / seeding / defaults may be skipped"""
+import pytest
+
+from core.startup.schema_stamp import SchemaStamp, STAMP_KEY, fingerprint
+
+
+class _DB:
+    """Settings-table stand-in (get_setting / set_setting)."""
+
+    def __init__(self):
+        self.settings = {}
+
+    def get_setting(self, key):
+        return self.settings.get(key)
+
+    def set_setting(self, key, value):
+        self.settings[key] = value
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "database" / "migrations").mkdir(parents=True)
+    (tmp_path / "database" / "seeders").mkdir()
+    (tmp_path / "modules" / "automation").mkdir(parents=True)
+    (tmp_path / "modules" / "whatsapp_engine").mkdir()
+    (tmp_path / "database" / "migrations" / "001_init.sql").write_text("CREATE TABLE a(x);")
+    (tmp_path / "database" / "seeders" / "default_data.py").write_text("SERVICES = 30\n")
+    (tmp_path / "modules" / "automation" / "automation_engine.py").write_text("RULES = 1\n")
+    (tmp_path / "modules" / "whatsapp_engine" / "wa_templates.py").write_text("T = 1\n")
+    return tmp_path
+
+
+def _stamped(db, root):
+    st = SchemaStamp(db, root)
+    assert st.save_if_clean({"applied": 1})
+    return SchemaStamp(db, root)
+
+
+def test_first_boot_is_not_fresh_then_stamped(root):
+    db = _DB()
+    assert not SchemaStamp(db, root).fresh
+    assert _stamped(db, root).fresh
+    assert db.settings[STAMP_KEY] == SchemaStamp(db, root).expected
+
+
+@pytest.mark.parametrize("rel, content", [
+    ("database/migrations/002_add_col.sql", "ALTER TABLE a ADD y;"),       # new migration
+    ("database/migrations/001_init.sql", "CREATE TABLE a(x, z);"),         # edited migration
+    ("database/seeders/default_data.py", "SERVICES = 31\n"),               # new CSC service
+])
+def test_stamp_changes_with_migrations_and_seeders(root, rel, content):
+    db = _DB()
+    _stamped(db, root)
+    (root / rel).write_text(content)
+    assert not SchemaStamp(db, root).fresh
+
+
+def test_unrelated_files_do_not_change_the_stamp(root):
+    db = _DB()
+    _stamped(db, root)
+    (root / "database" / "migrations" / "README.txt").write_text("notes")
+    assert SchemaStamp(db, root).fresh
+
+
+def test_fingerprint_tracks_missing_sources(root):
+    before = fingerprint(root, ("database/seeders", "database/extra"))
+    (root / "database" / "extra").mkdir()
+    (root / "database" / "extra" / "x.sql").write_text("x")
+    assert fingerprint(root, ("database/seeders", "database/extra")) != before
+
+
+@pytest.mark.parametrize("migrations", [None, {"applied": 0, "errors": ["003: locked"]},
+                                        {"applied": 2, "failed": 1}])
+def test_save_is_skipped_after_a_failed_migration(root, migrations):
+    db = _DB()
+    st = SchemaStamp(db, root)
+    assert not st.save_if_clean(migrations)
+    assert STAMP_KEY not in db.settings
+    assert not SchemaStamp(db, root).fresh
+
+
+def test_defaults_are_stamped_per_branch_and_kind(root):
+    db = _DB()
+    st = _stamped(db, root)
+    st.save_defaults("wa_templates", 1)
+    assert st.defaults_fresh("wa_templates", 1)
+    assert not st.defaults_fresh("wa_templates", 2)
+    assert not st.defaults_fresh("automation", 1)
+
+
+def test_defaults_go_stale_when_their_package_changes(root):
+    db = _DB()
+    st = _stamped(db, root)
+    st.save_defaults("automation", 1)
+    st.save_defaults("wa_templates", 1)
+    (root / "modules" / "automation" / "automation_engine.py").write_text("RULES = 2\n")
+    st2 = SchemaStamp(db, root)
+    assert not st2.defaults_fresh("automation", 1)
+    assert st2.defaults_fresh("wa_templates", 1)
+
+
+def test_db_without_settings_api_never_skips(root):
+    st = SchemaStamp(object(), root)
+    st.save()
+    assert not SchemaStamp(object(), root).fresh
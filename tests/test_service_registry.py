@@ -0,0 +1,61 @@
+"""core.services.service_registry - flags, lazy proxy, construction thread"""
+import queue, threading
+
+from core.services.service_registry import ServiceRegistry
+
+
+class _Flags:
+    def __init__(self, known):
+        self.known = known
+
+    def get_all(self):
+        return dict(self.known)
+
+    def is_enabled(self, name):
+        return self.known.get(name, False)
+
+
+def test_only_defined_flags_gate_services():
+    reg = ServiceRegistry(_Flags({"whatsapp": False}))
+    reg.register("whatsapp", lambda: "wa")
+    reg.register("automation", lambda: "auto")
+    assert reg.get("whatsapp") is None
+    assert reg.get("automation") == "auto"
+
+
+def test_proxy_is_falsy_when_construction_fails():
+    reg = ServiceRegistry()
+    reg.register("bad", lambda: 1 / 0)
+    reg.register("good", lambda: "x")
+    assert not reg.proxy("bad")
+    assert reg.proxy("good") and reg.proxy("good").upper() == "X"
+
+
+def test_failed_import_step_marks_service_failed():
+    reg = ServiceRegistry()
+    reg.register("wa", lambda: "wa", imports=("agms_no_such_module",))
+    assert reg.get("wa") is None
+    assert "agms_no_such_module" in reg.stats()["wa"]["error"]
+
+
+def test_gui_service_is_built_on_the_main_thread_for_worker_callers():
+    reg, posted, built, got = ServiceRegistry(), queue.Queue(), [], []
+    reg.register("wa", lambda: built.append(threading.current_thread()) or "wa",
+                 gui=True, imports=("json",))
+    reg.post_to_main = posted.put
+    worker = threading.Thread(target=lambda: got.append(reg.get("wa")))
+    worker.start()
+    posted.get(timeout=2)()                        # the "GUI loop" runs the build
+    worker.join(2)
+    assert got == ["wa"]
+    assert built == [threading.main_thread()]
+
+
+def test_non_gui_service_is_built_by_the_caller():
+    reg, built = ServiceRegistry(), []
+    reg.register("cloud", lambda: built.append(threading.current_thread()) or "cs")
+    reg.post_to_main = lambda fn: (_ for _ in ()).throw(AssertionError("posted"))
+    worker = threading.Thread(target=reg.get, args=("cloud",))
+    worker.start()
+    worker.join(2)
+    assert built == [worker]
@@ -0,0 +1,34 @@
+"""core.metrics.watchdog.classify - which subsystem blocked the GUI thread"""
+from traceback import FrameSummary
+
+import pytest
+
+from core.metrics.watchdog import classify
+
+APP      = "/opt/agms/main.py"
+WA       = "/opt/agms/modules/whatsapp_engine/wa_manager.py"
+DB       = "C:\\AGMS\\database\\db_manager.py"
+SELENIUM = "/venv/lib/site-packages/selenium/webdriver/remote/remote_connection.py"
+URLLIB3  = "/venv/lib/site-packages/urllib3/connectionpool.py"
+SOCKET   = "/usr/lib/python3.11/socket.py"
+SSL      = "/usr/lib/python3.11/ssl.py"
+SQLITE   = "/usr/lib/python3.11/sqlite3/dbapi2.py"
+
+
+def _stack(*paths):
+    """Outermost first, like traceback.extract_stack()."""
+    return [FrameSummary(p, i + 1, f"f{i}") for i, p in enumerate(paths)]
+
+
+@pytest.mark.parametrize("paths, expected", [
+    ((APP, WA, SELENIUM, URLLIB3, SOCKET), "WhatsApp"),    # app frame beats the network stack
+    ((APP, SELENIUM, URLLIB3, SOCKET),     "WhatsApp"),    # library beats generic network
+    ((APP, URLLIB3, SSL, SOCKET),          "network"),     # pure network stack
+    ((SOCKET,),                            "network"),
+    ((APP, DB, SQLITE),                    "DB call"),     # Windows separators
+    ((APP, WA, DB, SQLITE),                "DB call"),     # innermost app frame wins
+    ((APP,),                               "unknown"),
+    ((),                                   "unknown"),
+])
+def test_classify(paths, expected):
+    assert classify(_stack(*paths)) == expected
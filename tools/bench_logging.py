@@ -0,0 +1,105 @@
+"""
+tools/bench_logging.py - per-call logging cost under burst
+
+    python tools/bench_logging.py                 # 8 threads x 5000 records
+    python tools/bench_logging.py -t 16 -n 20000 --json
+
+Compares the old synchronous setup (StreamHandler + FileHandler on the
+caller's thread) with core.logs.log_pipeline (QueueHandler -> listener,
+rotating agms.log). Reports caller-side cost per call (median / p99 / max),
+the wall time to drain everything to disk, and how many identical warnings
+the dedup filter dropped.
+"""
+import argparse, io, logging, statistics, sys, tempfile, threading, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.logs import log_pipeline  # noqa: E402
+
+
+def _burst(threads: int, per_thread: int, repeat_warning: bool) -> list:
+    log   = logging.getLogger("AGMS.Bench")
+    costs = [[] for _ in range(threads)]
+    start = threading.Barrier(threads)
+
+    def worker(i):
+        out, clock = costs[i], time.perf_counter
+        start.wait()
+        for n in range(per_thread):
+            t = clock()
+            if repeat_warning and n % 10 == 0:
+                log.warning("HealthMonitor: DB latency high")      # same text each time
+            else:
+                log.info("thread %d record %d payload=%s", i, n, "x" * 64)
+            out.append(clock() - t)
+
+    ths = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for th in ths: th.start()
+    for th in ths: th.join()
+    return [c for per in costs for c in per]
+
+
+def _summary(label, costs, drain_s):
+    us = sorted(c * 1e6 for c in costs)
+    return {"setup": label, "calls": len(us),
+            "median_us": round(statistics.median(us), 2),
+            "p99_us": round(us[int(len(us) * 0.99) - 1], 2),
+            "max_us": round(us[-1], 2),
+            "drain_s": round(drain_s, 3)}
+
+
+def bench_sync(tmp: Path, threads: int, n: int) -> dict:
+    root = logging.getLogger()
+    root.handlers[:] = [logging.StreamHandler(io.StringIO()),
+                        logging.FileHandler(tmp / "sync.log", encoding="utf-8")]
+    fmt = logging.Formatter(log_pipeline.TEXT_FORMAT)
+    for h in root.handlers: h.setFormatter(fmt)
+    root.setLevel(logging.INFO)
+    t = time.perf_counter()
+    costs = _burst(threads, n, repeat_warning=True)
+    drain = time.perf_counter() - t
+    for h in root.handlers: h.close()
+    return _summary("sync FileHandler", costs, drain)
+
+
+def bench_queue(tmp: Path, threads: int, n: int, json_lines: bool) -> dict:
+    log_pipeline.configure_logging(tmp, json_lines=json_lines, console=False)
+    t = time.perf_counter()
+    costs = _burst(threads, n, repeat_warning=True)
+    log_pipeline.stop_logging()                 # waits until the queue is drained
+    drain = time.perf_counter() - t
+    res = _summary("queue pipeline" + (" (json)" if json_lines else ""), costs, drain)
+    written = sum(1 for _ in open(tmp / "agms.log", encoding="utf-8"))
+    res["dedup_dropped"] = len(costs) - written
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("-t", "--threads", type=int, default=8)
+    ap.add_argument("-n", "--per-thread", type=int, default=5000)
+    ap.add_argument("--json", action="store_true", help="also bench JSON-lines output")
+    args = ap.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="agms_logbench_") as tmp:
+        tmp = Path(tmp)
+        rows.append(bench_sync(tmp, args.threads, args.per_thread))
+        (tmp / "q").mkdir()
+        rows.append(bench_queue(tmp / "q", args.threads, args.per_thread, False))
+        if args.json:
+            (tmp / "j").mkdir()
+            rows.append(bench_queue(tmp / "j", args.threads, args.per_thread, True))
+
+    print(f"{args.threads} threads x {args.per_thread} records (10% repeated warnings)\n")
+    print(f"{'setup':<24}{'median us':>11}{'p99 us':>10}{'max us':>11}{'drain s':>10}{'deduped':>9}")
+    for r in rows:
+        print(f"{r['setup']:<24}{r['median_us']:>11.2f}{r['p99_us']:>10.2f}{r['max_us']:>11.0f}"
+              f"{r['drain_s']:>10.3f}{r.get('dedup_dropped', 0):>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
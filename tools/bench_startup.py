@@ -0,0 +1,140 @@
+"""
+tools/bench_startup.py - headless cold/warm start benchmark for main.py
+
+    python tools/bench_startup.py -n 5
+    python tools/bench_startup.py -n 5 --save bench/startup_3.0.0.json
+    python tools/bench_startup.py -n 5 --baseline bench/startup_3.0.0.json --max-regress 15
+
+  cold = a fresh temp database, data/ and logs/ every run (migrations, seeding,
+         asset cache and splash timings all from empty)
+  warm = one temp database + data/ + logs/, primed once, then re-used
+The real install's data/ and logs/ are never written (AGMS_DATA_DIR / AGMS_LOGS_DIR).
+Every run is `main.py --profile-startup --boot-only --db-path <tmp>` on Qt's
+offscreen platform; the JSON profiles are aggregated per stage (median / max).
+Exit code 1 when --baseline is given and a median regressed past the limit.
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+NOISE_MS = 5.0          # ignore regressions smaller than this
+
+
+def run_once(home: Path, out: Path) -> dict:
+    """One boot with database, data/ and logs/ all under `home`."""
+    db_path = home / "agms.db"
+    home.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1",
+               AGMS_DATA_DIR=str(home / "data"), AGMS_LOGS_DIR=str(home / "logs"))
+    cmd = [sys.executable, str(ROOT / "main.py"), "--profile-startup", "--boot-only",
+           "--db-path", str(db_path), "--profile-out", str(out)]
+    t = time.perf_counter()
+    r = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = (time.perf_counter() - t) * 1000
+    if r.returncode != 0 or not out.exists():
+        raise RuntimeError(f"boot failed (rc={r.returncode}):\n{r.stdout[-2000:]}\n{r.stderr[-2000:]}")
+    rep = json.loads(out.read_text(encoding="utf-8"))
+    rep["process_ms"] = round(wall, 2)
+    return rep
+
+
+def summarise(reports: list) -> dict:
+    def agg(vals):
+        return {"median": round(statistics.median(vals), 2), "max": round(max(vals), 2)}
+
+    stages = {}
+    for rep in reports:
+        for st in rep["stages"]:
+            d = stages.setdefault(st["stage"], {"elapsed_ms": [], "import_ms": [], "run_ms": []})
+            for k in d:
+                d[k].append(st.get(k, 0.0))
+    return {
+        "runs":       len(reports),
+        "process_ms": agg([r["process_ms"] for r in reports]),
+        "total_ms":   agg([r["total_ms"] for r in reports]),
+        "import_ms":  agg([r["import_ms"]["total"] for r in reports]),
+        "stages":     {n: {k: agg(v) for k, v in d.items()} for n, d in stages.items()},
+    }
+
+
+def bench(n: int) -> dict:
+    result = {}
+    with tempfile.TemporaryDirectory(prefix="agms_bench_") as tmp:
+        tmp = Path(tmp)
+        cold = []
+        for i in range(n):
+            cold.append(run_once(tmp / f"cold_{i}", tmp / f"cold_{i}.json"))
+            print(f"  cold #{i + 1}: {cold[-1]['process_ms']:.0f} ms")
+        warm_home = tmp / "warm"
+        run_once(warm_home, tmp / "prime.json")
+        warm = []
+        for i in range(n):
+            warm.append(run_once(warm_home, tmp / f"warm_{i}.json"))
+            print(f"  warm #{i + 1}: {warm[-1]['process_ms']:.0f} ms")
+    result["cold"] = summarise(cold)
+    result["warm"] = summarise(warm)
+    return result
+
+
+def print_table(result: dict):
+    for mode in ("cold", "warm"):
+        r = result[mode]
+        print(f"\n{mode.upper()}  process {r['process_ms']['median']:.0f} ms  "
+              f"profile {r['total_ms']['median']:.0f} ms  imports {r['import_ms']['median']:.0f} ms")
+        print(f"  {'stage':<22}{'wall':>10}{'import':>10}{'run':>10}{'max':>10}")
+        for name, d in sorted(result[mode]["stages"].items(),
+                              key=lambda kv: -kv[1]["elapsed_ms"]["median"]):
+            print(f"  {name:<22}{d['elapsed_ms']['median']:>10.1f}{d['import_ms']['median']:>10.1f}"
+                  f"{d['run_ms']['median']:>10.1f}{d['elapsed_ms']['max']:>10.1f}")
+
+
+def regressions(result: dict, baseline: dict, pct: float) -> list:
+    out = []
+
+    def check(label, new, old):
+        if new > old * (1 + pct / 100) and new - old > NOISE_MS:
+            out.append(f"{label}: {old:.1f} -> {new:.1f} ms")
+
+    for mode in ("cold", "warm"):
+        new, old = result.get(mode), baseline.get(mode)
+        if not new or not old:
+            continue
+        check(f"{mode} total", new["total_ms"]["median"], old["total_ms"]["median"])
+        for name, d in new["stages"].items():
+            if name in old["stages"]:
+                check(f"{mode} {name}", d["elapsed_ms"]["median"],
+                      old["stages"][name]["elapsed_ms"]["median"])
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("-n", "--runs", type=int, default=5)
+    ap.add_argument("--save", help="write the summary JSON here")
+    ap.add_argument("--baseline", help="summary JSON of a previous release")
+    ap.add_argument("--max-regress", type=float, default=15.0, help="allowed slowdown in %%")
+    args = ap.parse_args()
+
+    print(f"AGMS startup benchmark: {args.runs} cold + {args.runs} warm runs")
+    result = bench(args.runs)
+    print_table(result)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"\nSaved: {args.save}")
+
+    if args.baseline:
+        base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        bad  = regressions(result, base, args.max_regress)
+        if bad:
+            print(f"\nREGRESSIONS (> {args.max_regress:.0f}%):")
+            for line in bad:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+tools/time_migrations.py - time migrations / seeding against a copy of a real DB
+
+    python tools/time_migrations.py data/agms.db
+    python tools/time_migrations.py backup/agms_branch3.db -n 5 --seed --json
+
+The source database is never touched: each run copies it to a temp file with
+sqlite3's online backup API (safe while AGMS has it open). Per run:
+  run_all    - full database.migrations.run_migrations.run_all() walk
+  run_all_2  - the same walk again (nothing left to apply)
+  seed_all   - database.seeders.default_data.seed_all()
+  fast_path  - SchemaStamp check (fingerprint + one settings query), i.e.
+               what a normal boot pays once the stamp is stored
+seed_all / fast_path need --seed (opens the copy with this install's keys).
+"""
+import argparse, json, sqlite3, statistics, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def copy_db(src: Path, dst: Path):
+    s, d = sqlite3.connect(f"file:{src}?mode=ro", uri=True), sqlite3.connect(dst)
+    try:
+        s.backup(d)
+    finally:
+        s.close(); d.close()
+
+
+def _ms(fn, *a):
+    t = time.perf_counter()
+    r = fn(*a)
+    return (time.perf_counter() - t) * 1000, r
+
+
+def _open_db(path: Path):
+    import config.settings as s
+    s.DB_PATH = path
+    from core.security.encryption import EncryptionManager
+    from database.db_manager import DatabaseManager
+    db = DatabaseManager(EncryptionManager())
+    db.initialise()
+    return db
+
+
+def run_once(src: Path, tmp: Path, seed: bool) -> dict:
+    from database.migrations.run_migrations import run_all
+    from core.startup.schema_stamp import SchemaStamp
+
+    dst = tmp / "agms_copy.db"
+    if dst.exists():
+        dst.unlink()
+    t, _ = _ms(copy_db, src, dst)
+    row = {"copy_ms": t, "size_mb": dst.stat().st_size / 1e6}
+    row["run_all_ms"], r = _ms(run_all, str(dst))
+    row["applied"] = r.get("applied", 0)
+    row["run_all_2_ms"], _ = _ms(run_all, str(dst))
+    if seed:
+        db = _open_db(dst)
+        from database.seeders.default_data import seed_all
+        row["seed_all_ms"], _ = _ms(seed_all, db)
+        stamp = SchemaStamp(db, ROOT)
+        stamp.save()
+        row["fast_path_ms"], st = _ms(SchemaStamp, db, ROOT)
+        row["fast_path_hit"] = st.fresh
+    return row
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("db", type=Path, help="production database (read only)")
+    ap.add_argument("-n", "--runs", type=int, default=3)
+    ap.add_argument("--seed", action="store_true", help="also time seed_all + stamp fast path")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+    if not args.db.exists():
+        ap.error(f"{args.db} not found")
+
+    with tempfile.TemporaryDirectory(prefix="agms_migbench_") as tmp:
+        rows = [run_once(args.db.resolve(), Path(tmp), args.seed) for _ in range(args.runs)]
+
+    keys = [k for k in rows[0] if k.endswith("_ms")]
+    summary = {k: {"median": round(statistics.median(r[k] for r in rows), 2),
+                   "max": round(max(r[k] for r in rows), 2)} for k in keys}
+    summary.update(db=str(args.db), runs=args.runs, size_mb=round(rows[0]["size_mb"], 1),
+                   applied=rows[0]["applied"], fast_path_hit=rows[0].get("fast_path_hit"))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    print(f"{args.db} ({summary['size_mb']} MB), {args.runs} runs, "
+          f"{summary['applied']} migrations applied on a fresh copy\n")
+    print(f"{'step':<16}{'median ms':>11}{'max ms':>10}")
+    for k in keys:
+        print(f"{k[:-3]:<16}{summary[k]['median']:>11.2f}{summary[k]['max']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())